@@ -7,11 +7,16 @@ import tkinter as tk
 import math
 import time
 import os
-import socket
-import csv
 import ctypes
 from ctypes import wintypes
 
+from clock_geometry import dial_geometry
+from clock_engine import CHANGED_LAYOUT, HAND_HOUR, HAND_MINUTE, HAND_SECOND, ClockEngine
+from clock_time import take_snapshot
+from clock_theme import TIME_JUMP_THRESHOLD_S, is_dark_time, seconds_until_transition
+from clock_settings import open_settings, read_legacy_settings
+from clock_positions import open_positions
+
 # 定数定義
 WINDOW_SIZE = "400x420"
 CLOCK_RADIUS = 190
@@ -22,7 +27,8 @@ LENGTH_HOUR_HAND = 100
 NUMBER_DISTANCE = 155  # 中心から数字までの距離
 UPDATE_INTERVAL = 1000  # 1秒ごとに更新
 FONT_SIZE = 32
-AUTO_CHECK_INTERVAL_MS = 60000  # Auto切替のチェック間隔（1分）
+TICK_LENGTH_MAJOR = 20  # 5分毎の目盛りの長さ
+TICK_LENGTH_MINOR = 10
 
 # 変更可能な定数
 clock_size = 1  # 時計のサイズモード
@@ -32,20 +38,31 @@ factor = 1.0
 is_dark_theme = False
 is_auto_theme = True  # デフォルトON
 update_job = None
+engine = None  # clock_engine.ClockEngine（表示中の針位置を保持し、変化した針だけを返す）
+last_update_time = None  # 前回の針更新の実時刻（時計の飛びの検出用）
 datetime_job = None
 auto_job = None
+is_suspended = False  # 最小化/非表示で更新を止めているか
+root = None
+canvas = None
 header_frame = None
 datetime_label = None
 color_button = None
 auto_checkbutton = None
 auto_var = None
 size_button = None
-
-# 定数としてウィンドウ位置情報を保存するファイル名を設定
-POSITION_FILE = 'window_position_app_analog_clock.csv'
-
-# 定数としてホスト名を取得
-HOSTNAME = socket.gethostname()
+settings = None  # clock_settings.SettingsStore（main で開く）
+positions = None  # clock_positions.PositionStore（このホストのウィンドウ位置）
+
+# 設定（倍率/テーマ/Auto はアプリ共通）。ウィンドウ位置はホストごとのファイル（clock_positions）。
+# 旧 factor.txt / window_position_app_analog_clock.csv は設定ファイルが無いときに一度だけ取り込む
+SETTINGS_NAME = 'app_analog_clock'
+SETTINGS_DEFAULTS = {
+    'factor': 1.0,
+    'theme': 'light',
+    'auto_theme': True,
+}
+FACTORS = [1, 1.5, 2, 2.5]
 
 def get_exception_trace():
     '''例外のトレースバックを取得'''
@@ -53,90 +70,100 @@ def get_exception_trace():
     trace = traceback.format_exception(t, v, tb)
     return trace
 
-def save_position(root):
+def window_position(root):
     """
-    ウィンドウの位置のみをCSVファイルに保存する。異なるホストの情報も保持。
+    root.geometry()（"WxH+X+Y"）から位置 [X, Y] を取り出す。負の座標は "+-10" の形になる
     """
-    print("ウィンドウ位置を保存中...")
-    # root.geometry()から位置情報のみを取り出す
-    position_info = root.geometry().split('+')[1:]
-    position_str = '+' + '+'.join(position_info)
-    position_data = [HOSTNAME, position_str]
-    existing_data = []
+    parts = root.geometry().split('+')[1:]
     try:
-        # 既存のデータを読み込んで、現在のホスト以外の情報を保持
-        with open(POSITION_FILE, newline='', encoding="utf_8_sig") as csvfile:
-            reader = csv.reader(csvfile)
-            existing_data = [row for row in reader if row[0] != HOSTNAME]
-    except FileNotFoundError:
-        print("ファイルが存在しないため、新規作成します。")
-    
-    # 現在のホストの情報を含む全データを書き込む
-    existing_data.append(position_data)
-    with open(POSITION_FILE, 'w', newline='', encoding="utf_8_sig") as csvfile:
-        writer = csv.writer(csvfile)
-        writer.writerows(existing_data)
-    print("保存完了")
+        return [int(parts[0]), int(parts[1])]
+    except (IndexError, ValueError):
+        return None
+
+def save_position(root):
+    """
+    ウィンドウの位置のみを位置ストアに記録する（書き込みは位置ストアがまとめて遅延実行）
+    """
+    position = window_position(root)
+    if position is not None:
+        positions.set(position)
 
 def restore_position(root):
     """
-    CSVファイルからウィンドウの位置のみを復元する。
+    このホストで保存されたウィンドウ位置を復元する。
+    """
+    position = positions.get()
+    try:
+        x, y = (int(v) for v in position)
+    except (TypeError, ValueError):
+        return
+    # サイズ情報なしで位置情報のみを設定
+    root.geometry(f'+{x}+{y}')
+
+def on_configure(event):
     """
-    print("ウィンドウ位置を復元中...")
+    ウィンドウの移動/リサイズ。ドラッグ中の連続したイベントは位置ストア側で1回の書き込みにまとまる
+    """
+    if event.widget is root:
+        save_position(root)
+
+def restore_settings():
+    """
+    起動時に倍率/テーマ/Auto を設定から復元する（ウィジェット作成前に呼ぶ）
+    """
+    global factor, clock_size, is_dark_theme, is_auto_theme
     try:
-        with open(POSITION_FILE, newline='', encoding="utf_8_sig") as csvfile:
-            reader = csv.reader(csvfile)
-            for row in reader:
-                if row[0] == HOSTNAME:
-                    position_str = row[1].strip()  # 余計な空白がないか確認
-                    if position_str.startswith('+'):
-                        position_str = position_str[1:]  # 先頭の余分な '+' を取り除く
-                    print(f"復元データ: {position_str}")
-                    # サイズ情報なしで位置情報のみを設定
-                    root.geometry('+' + position_str)
-                    break
-    except FileNotFoundError:
-        print("位置情報ファイルが見つかりません。")
+        saved = float(settings.get('factor'))
+    except (TypeError, ValueError):
+        saved = 1.0
+    # 近似一致で一覧の倍率へ寄せる（浮動小数の誤差対策）
+    diffs = [abs(saved - f) for f in FACTORS]
+    clock_size = diffs.index(min(diffs)) + 1
+    factor = FACTORS[clock_size - 1]
+    is_dark_theme = settings.get('theme') == 'dark'
+    is_auto_theme = bool(settings.get('auto_theme'))
+
+
+# テーマ色（毎回生成しないよう定数として保持）
+DARK_COLORS = {
+    'bg': '#2b2b2b',
+    'canvas_bg': 'black',
+    'line_color': 'white',
+    'number_color': '#dddddd',
+    'tick_color': '#bbbbbb',
+    'circle_outline': 'white',
+    'center_color': 'white',
+    'button_bg': '#3a3a3a',
+    'button_fg': '#f0f0f0',
+    'button_active_bg': '#4a4a4a',
+    'button_active_fg': '#ffffff',
+    'check_bg': '#2b2b2b',
+    'check_fg': '#f0f0f0',
+    'check_select_color': '#4a90e2',
+}
+LIGHT_COLORS = {
+    'bg': 'white',
+    'canvas_bg': 'white',
+    'line_color': 'black',
+    'number_color': 'gray',
+    'tick_color': 'gray',
+    'circle_outline': 'black',
+    'center_color': 'black',
+    'button_bg': '#f0f0f0',
+    'button_fg': 'black',
+    'button_active_bg': '#e0e0e0',
+    'button_active_fg': 'black',
+    'check_bg': 'white',
+    'check_fg': 'black',
+    'check_select_color': '#1976d2',
+}
 
 
 def get_theme_colors():
     """
     現在のテーマに応じた色設定を返す
     """
-    if is_dark_theme:
-        return {
-            'bg': '#2b2b2b',
-            'canvas_bg': 'black',
-            'line_color': 'white',
-            'number_color': '#dddddd',
-            'tick_color': '#bbbbbb',
-            'circle_outline': 'white',
-            'center_color': 'white',
-            'button_bg': '#3a3a3a',
-            'button_fg': '#f0f0f0',
-            'button_active_bg': '#4a4a4a',
-            'button_active_fg': '#ffffff',
-            'check_bg': '#2b2b2b',
-            'check_fg': '#f0f0f0',
-            'check_select_color': '#4a90e2',
-        }
-    else:
-        return {
-            'bg': 'white',
-            'canvas_bg': 'white',
-            'line_color': 'black',
-            'number_color': 'gray',
-            'tick_color': 'gray',
-            'circle_outline': 'black',
-            'center_color': 'black',
-            'button_bg': '#f0f0f0',
-            'button_fg': 'black',
-            'button_active_bg': '#e0e0e0',
-            'button_active_fg': 'black',
-            'check_bg': 'white',
-            'check_fg': 'black',
-            'check_select_color': '#1976d2',
-        }
+    return DARK_COLORS if is_dark_theme else LIGHT_COLORS
 
 
 def apply_theme_styles():
@@ -186,18 +213,16 @@ def apply_theme_styles():
         pass
 
 
-def redraw_clock():
+def recolor_clock():
     """
-    針更新のafterを一旦解除してから再描画
+    作成済みのキャンバス項目をタグ単位で再着色する（項目の作り直しはしない）
     """
-    global update_job
-    if update_job is not None:
-        try:
-            canvas.after_cancel(update_job)
-        except Exception:
-            pass
-        update_job = None
-    draw_clock(canvas)
+    colors = get_theme_colors()
+    canvas.itemconfigure('dial', outline=colors['circle_outline'])
+    canvas.itemconfigure('number', fill=colors['number_color'])
+    canvas.itemconfigure('tick', fill=colors['tick_color'])
+    canvas.itemconfigure('center', fill=colors['center_color'], outline=colors['center_color'])
+    canvas.itemconfigure('hand', fill=colors['line_color'])
 
 
 def toggle_theme():
@@ -206,8 +231,9 @@ def toggle_theme():
     """
     global is_dark_theme
     is_dark_theme = not is_dark_theme
+    settings.set('theme', 'dark' if is_dark_theme else 'light')
     apply_theme_styles()
-    redraw_clock()
+    recolor_clock()
 
 
 def set_titlebar_dark_mode(enable):
@@ -230,17 +256,6 @@ def set_titlebar_dark_mode(enable):
         pass
 
 
-def is_dark_time(now=None):
-    """
-    06:00〜18:29:59 を通常（ライト）、18:30〜05:59:59 をダークとする
-    """
-    if now is None:
-        now = time.localtime()
-    current_minutes = now.tm_hour * 60 + now.tm_min
-    # ダーク: 18:30(1110分)〜23:59, および 00:00〜05:59(359分)
-    return current_minutes >= (18 * 60 + 30) or current_minutes < (6 * 60)
-
-
 def apply_auto_theme_now():
     """
     Autoモードが有効なとき、現在時刻に応じてテーマを適用
@@ -252,31 +267,49 @@ def apply_auto_theme_now():
     if is_dark_theme != should_dark:
         is_dark_theme = should_dark
         apply_theme_styles()
-        redraw_clock()
+        recolor_clock()
 
 
-def auto_theme_loop():
+def schedule_auto_theme():
     """
-    一定間隔で自動テーマ切替をチェック
+    次のテーマ切替時刻に一度だけ発火する after を張り直す（毎分のポーリングはしない）
     """
     global auto_job
+    try:
+        if auto_job is not None:
+            root.after_cancel(auto_job)
+    except Exception:
+        pass
+    auto_job = None
     if is_auto_theme:
-        apply_auto_theme_now()
         try:
-            auto_job = root.after(AUTO_CHECK_INTERVAL_MS, auto_theme_loop)
+            # 切替時刻ちょうどに起きるよう 1ms 余分に待つ
+            delay_ms = math.ceil(seconds_until_transition() * 1000) + 1
+            auto_job = root.after(delay_ms, on_auto_transition)
         except Exception:
             pass
 
 
+def on_auto_transition():
+    """
+    切替時刻に到達したらテーマを適用し、次の切替を予約する
+    """
+    global auto_job
+    auto_job = None
+    apply_auto_theme_now()
+    schedule_auto_theme()
+
+
 def on_auto_toggle():
     """
     AutoモードのON/OFF切替ハンドラ
     """
     global is_auto_theme, auto_job
     is_auto_theme = bool(auto_var.get())
+    settings.set('auto_theme', is_auto_theme)
     if is_auto_theme:
         apply_auto_theme_now()
-        auto_theme_loop()
+        schedule_auto_theme()
     else:
         try:
             if auto_job is not None:
@@ -287,79 +320,22 @@ def on_auto_toggle():
 
 
 def toggle_clock_size():
-    global factor, clock_size, root
-    clock_size = (clock_size % 4) + 1
-    factor = [1, 1.5, 2, 2.5][clock_size - 1]
-
-    # factor を保存する処理（ファイルに書き込みなど）
-    with open('factor.txt', 'w') as f:
-        f.write(str(factor))
-
-    # 位置情報の保存
-    save_position(root)
-
-    # 現在のウィンドウを破壊
-    root.destroy()
-
-    # アプリケーションを再起動
-    restart_application()
-
-
-def restart_application():
-    global root, canvas, header_frame, datetime_label, size_button, color_button, auto_checkbutton, auto_var
-
-    # アプリケーションの再起動
-    root = tk.Tk()
-    root.title("アナログ時計")
-    root.geometry(WINDOW_SIZE)
+    """
+    サイズを循環させ、Tk ルートを作り直さずにその場で再レイアウトする
+    """
+    global factor, clock_size
+    clock_size = (clock_size % len(FACTORS)) + 1
+    factor = FACTORS[clock_size - 1]
 
-    # factor を読み込む
-    with open('factor.txt', 'r') as f:
-        global factor
-        factor = float(f.read())
+    # 倍率を設定に記録（ディスクへの書き込みは設定ストアが遅延してまとめて行う）
+    settings.set('factor', factor)
 
     # ウィンドウサイズと中心の再計算
     apply_factor_settings()
 
-    # ヘッダフレーム（ボタン/デジタル時計）
-    header_frame = tk.Frame(root)
-    header_frame.pack(side='top', anchor='nw')
-
-    # デジタル日時ラベル（左端）
-    datetime_font_size = max(10, int(12 * factor))
-    datetime_label = tk.Label(header_frame, text="", font=("Helvetica", datetime_font_size))
-    datetime_label.pack(side='left')
-
-    size_button = tk.Button(header_frame, text="サイズ変更", command=toggle_clock_size)
-    size_button.pack(side='left')
-
-    color_button = tk.Button(header_frame, text="カラー変更", command=toggle_theme)
-    color_button.pack(side='left')
-
-    # Autoトグル（カラー変更ボタンの右側）
-    auto_var = tk.BooleanVar(value=is_auto_theme)
-    auto_checkbutton = tk.Checkbutton(header_frame, text="Auto", variable=auto_var, command=on_auto_toggle)
-    auto_checkbutton.pack(side='left')
-
-    # 時計の文字盤を描画
-    canvas = tk.Canvas(root, width=400, height=400, bg=get_theme_colors()['canvas_bg'])
-    canvas.pack(expand=True, fill=tk.BOTH)
-
-    draw_clock(canvas)
-
-    # 位置情報の復元
-    restore_position(root)
-
-    # テーマ適用 & デジタル日時開始
-    apply_theme_styles()
-    update_datetime_label()
-
-    # Autoモードの初回適用とスケジューリング
-    apply_auto_theme_now()
-    auto_theme_loop()
-
-    root.protocol("WM_DELETE_WINDOW", on_close)
-    root.mainloop()
+    # 倍率が変わるとエンジンが寸法の変化（CHANGED_LAYOUT）を返し、move_hands が既存の項目を置き直す
+    move_hands(canvas)
+    datetime_label.config(font=("Helvetica", max(10, int(12 * factor))))
 
 
 def apply_factor_settings():
@@ -376,57 +352,111 @@ def apply_factor_settings():
     WINDOW_SIZE = f"{int(window_width)}x{int(window_height)}"
     root.geometry(WINDOW_SIZE)
 
+
+def current_geometry():
+    """
+    現在の倍率に対する目盛り/数字/針の座標表（倍率ごとに一度だけ計算される）
+    """
+    return dial_geometry(CENTER[0], CENTER[1], CLOCK_RADIUS, NUMBER_DISTANCE, TICK_LENGTH_MAJOR, TICK_LENGTH_MINOR)
+
+def current_engine():
+    """
+    現在の倍率の座標表で針の位置/差分を求めるエンジン（倍率が変わったら置き直す）
+    """
+    global engine
+    geometry = current_geometry()
+    lengths = (LENGTH_HOUR_HAND, LENGTH_MINUTE_HAND, LENGTH_SECOND_HAND)
+    if engine is None:
+        engine = ClockEngine(geometry, lengths)
+    elif engine.geometry is not geometry:
+        engine.set_layout(geometry, lengths)
+    return engine
+
 def draw_ticks(canvas):
     """
     時計の目盛り線を描画する関数
     各目盛りは、1分ごと（6度ごと）に描画される
     """
+    geometry = current_geometry()
     for i in range(60):  # 1分ごとの目盛りのため、60回繰り返す
-        if i % 5 == 0:
-            tick_length = 20  # 目盛りの長さ
-            tick_width = 3
-        else:
-            tick_length = 10  # 目盛りの長さ
-            tick_width = 1
-
-        angle = math.radians(i * 6)  # 1分につき6度
-        start_x = CENTER[0] + (CLOCK_RADIUS - tick_length) * math.cos(angle)
-        start_y = CENTER[1] + (CLOCK_RADIUS - tick_length) * math.sin(angle)
-        end_x = CENTER[0] + CLOCK_RADIUS * math.cos(angle)
-        end_y = CENTER[1] + CLOCK_RADIUS * math.sin(angle)
-        canvas.create_line(start_x, start_y, end_x, end_y, fill=get_theme_colors()['tick_color'], width=tick_width)
+        tick_width = 3 if i % 5 == 0 else 1
+        canvas.create_line(*geometry.tick(i), fill=get_theme_colors()['tick_color'], width=tick_width, tags='tick')
 
-def draw_clock(canvas):
-    canvas.delete("all")  # 既存の描画をすべて削除
-    canvas.create_oval(
+def dial_coords():
+    return (
         CENTER[0] - CLOCK_RADIUS,
         CENTER[1] - CLOCK_RADIUS,
         CENTER[0] + CLOCK_RADIUS,
         CENTER[1] + CLOCK_RADIUS,
-        outline=get_theme_colors()['circle_outline']
+    )
+
+def center_dot_coords():
+    dot_radius = 7  # 中心点の半径
+    return (
+        CENTER[0] - dot_radius,
+        CENTER[1] - dot_radius,
+        CENTER[0] + dot_radius,
+        CENTER[1] + dot_radius,
+    )
+
+def relayout_static(canvas):
+    """
+    作成済みの文字盤の項目を現在の倍率の座標/フォントへ移動する（項目は作り直さない）
+    """
+    geometry = current_geometry()
+    canvas.coords('dial', *dial_coords())
+    # find_withtag は作成順（= 描画順）で返る
+    for i, item in enumerate(canvas.find_withtag('tick')):
+        canvas.coords(item, *geometry.tick(i))
+    for i, item in enumerate(canvas.find_withtag('number'), start=1):
+        canvas.coords(item, *geometry.number(i))
+    canvas.itemconfigure('number', font=("Helvetica", FONT_SIZE))
+    canvas.coords('center', *center_dot_coords())
+
+def draw_clock(canvas):
+    """
+    文字盤と針のキャンバス項目をタグ付きで一度だけ作成し、針の更新を開始する。
+    以降の更新は coords/itemconfigure で行い、項目の削除・再作成はしない。
+    """
+    global update_job
+    if update_job is not None:
+        try:
+            canvas.after_cancel(update_job)
+        except Exception:
+            pass
+        update_job = None
+    canvas.delete("all")  # 既存の描画をすべて削除
+    canvas.create_oval(
+        *dial_coords(),
+        outline=get_theme_colors()['circle_outline'],
+        tags='dial'
     )
     draw_numbers(canvas)
-    draw_ticks(canvas)  
+    draw_ticks(canvas)
     draw_center_dot(canvas)
-    update_clock(canvas, [])
+    # 針は中心に長さ0で作成し、update_clock で座標だけを更新する
+    line_color = get_theme_colors()['line_color']
+    for tag, width in (('hand_hour', 14), ('hand_minute', 8), ('hand_second', 3)):
+        canvas.create_line(CENTER[0], CENTER[1], CENTER[0], CENTER[1], width=width, fill=line_color, tags=('hand', tag))
+    current_engine().reset_hands()
+    update_clock(canvas)
 
 def draw_center_dot(canvas):
     """
     時計の中心に小さな黒い丸を描画する関数
     """
-    dot_radius = 7  # 中心点の半径
     colors = get_theme_colors()
     canvas.create_oval(
-        CENTER[0] - dot_radius,
-        CENTER[1] - dot_radius,
-        CENTER[0] + dot_radius,
-        CENTER[1] + dot_radius,
+        *center_dot_coords(),
         fill=colors['center_color'],
-        outline=colors['center_color']
+        outline=colors['center_color'],
+        tags='center'
     )
 
-# アプリケーションの終了時の処理をカスタマイズする
-def on_close():
+def cancel_jobs():
+    """
+    針/デジタル日時/自動テーマの after をすべて解除する
+    """
     global datetime_job, update_job, auto_job
     try:
         if datetime_job is not None:
@@ -443,61 +473,79 @@ def on_close():
             root.after_cancel(auto_job)
     except Exception:
         pass
-    save_position(root)  # ウィンドウの位置を保存
-    root.destroy()  # ウィンドウを破壊する
+    datetime_job = update_job = auto_job = None
+
 
-def draw_hand(canvas, center, length, angle, width):
+def on_unmap(event):
     """
-    時計の針を描画する関数
-    center: 中心点 (x, y)
-    length: 針の長さ
-    angle: 針の角度 (度)
-    width: 針の幅
-    返り値: 針のアイテムID
+    最小化/非表示になったら更新タイマーをすべて止める
     """
-    angle_rad = math.radians(angle)
-    end_x = center[0] + length * math.sin(angle_rad)
-    end_y = center[1] - length * math.cos(angle_rad)
-    return canvas.create_line(center[0], center[1], end_x, end_y, width=width, fill=get_theme_colors()['line_color'])
+    global is_suspended
+    if event.widget is not root or is_suspended:
+        return
+    is_suspended = True
+    cancel_jobs()
 
-def update_clock(canvas, hand_ids):
+
+def on_map(event):
     """
-    時計を更新する関数
+    再表示されたら時刻/テーマ/針を即座に同期し、更新を再開する
     """
-    # 既存の針を削除
-    for hand_id in hand_ids:
-        canvas.delete(hand_id)
+    global is_suspended
+    if event.widget is not root or not is_suspended:
+        return
+    is_suspended = False
+    cancel_jobs()
+    update_clock(canvas)
+    update_datetime_label()
+    apply_auto_theme_now()
+    schedule_auto_theme()
 
-    now = time.localtime()
-    hour = now.tm_hour
-    minute = now.tm_min
-    second = now.tm_sec
 
-    # 時針、分針、秒針の角度を計算
-    hour_angle = ((hour % 12) + minute / 60) * 30  # 1時間あたり30度
-    minute_angle = minute * 6  # 1分あたり6度
-    second_angle = second * 6  # 1秒あたり6度
+# アプリケーションの終了時の処理をカスタマイズする
+def on_close():
+    cancel_jobs()
+    save_position(root)  # ウィンドウの位置を保存
+    positions.close()
+    settings.close()  # 未保存の設定を書き出す
+    root.destroy()  # ウィンドウを破壊する
 
-    # 針を描画して、各アイテムIDを保存
-    new_hand_ids = [
-        draw_hand(canvas, CENTER, LENGTH_HOUR_HAND, hour_angle, width=14),
-        draw_hand(canvas, CENTER, LENGTH_MINUTE_HAND, minute_angle, width=8),
-        draw_hand(canvas, CENTER, LENGTH_SECOND_HAND, second_angle, width=3)
-    ]
+def move_hands(canvas):
+    """
+    現在時刻に合わせて、位置が変わった針の座標のみ更新する（位置/座標/変化は clock_engine が求める）
+    """
+    frame = current_engine().frame(take_snapshot())
+    if frame.changed & CHANGED_LAYOUT:
+        relayout_static(canvas)
+    for hand, tag in ((HAND_HOUR, 'hand_hour'), (HAND_MINUTE, 'hand_minute'), (HAND_SECOND, 'hand_second')):
+        if frame.hand_changed(hand):
+            canvas.coords(tag, CENTER[0], CENTER[1], *frame.ends[hand])
 
-    global update_job
-    update_job = canvas.after(UPDATE_INTERVAL, update_clock, canvas, new_hand_ids)  # 1秒後に再度更新
+def update_clock(canvas):
+    """
+    時計を更新する関数
+    """
+    global update_job, last_update_time
+    now = time.time()
+    if last_update_time is not None:
+        elapsed = now - last_update_time
+        if elapsed < 0 or elapsed > TIME_JUMP_THRESHOLD_S:
+            # スリープ復帰/時計変更/再表示: 自動テーマの判定と予約をやり直す
+            apply_auto_theme_now()
+            schedule_auto_theme()
+    last_update_time = now
+    move_hands(canvas)
+    update_job = canvas.after(UPDATE_INTERVAL, update_clock, canvas)  # 1秒後に再度更新
 
 
 def draw_numbers(canvas):
     """
     時計の数字を描画する関数
     """
+    geometry = current_geometry()
     for i in range(1, 13):
-        angle = math.radians(i * 30 - 90)
-        x = CENTER[0] + NUMBER_DISTANCE * math.cos(angle)
-        y = CENTER[1] + NUMBER_DISTANCE * math.sin(angle)
-        canvas.create_text(x, y, text=str(i), font=("Helvetica", FONT_SIZE), fill=get_theme_colors()['number_color'])
+        x, y = geometry.number(i)
+        canvas.create_text(x, y, text=str(i), font=("Helvetica", FONT_SIZE), fill=get_theme_colors()['number_color'], tags='number')
 
 
 def update_datetime_label():
@@ -515,53 +563,71 @@ def update_datetime_label():
         pass
 
 
-# メイン処理
-try:
-    # Tkinterのウィンドウを作成
-    root = tk.Tk()
-    root.title("アナログ時計")
-    root.geometry(WINDOW_SIZE)
-    restore_position(root)
-    root.protocol("WM_DELETE_WINDOW", on_close)  # 終了時処理の設定
-
-    # ヘッダフレーム（ボタン/デジタル時計）
-    header_frame = tk.Frame(root)
-    header_frame.pack(side='top', anchor='nw')
-
-    # デジタル日時ラベル（左端）
-    datetime_font_size = max(10, int(12 * factor))
-    datetime_label = tk.Label(header_frame, text="", font=("Helvetica", datetime_font_size))
-    datetime_label.pack(side='left')
-
-    size_button = tk.Button(header_frame, text="サイズ変更", command=toggle_clock_size)
-    size_button.pack(side='left')
-
-    color_button = tk.Button(header_frame, text="カラー変更", command=toggle_theme)
-    color_button.pack(side='left')
+def main():
+    """
+    メイン処理（import 時には実行しない。ベンチマーク等から関数単位で利用できるようにする）
+    """
+    global root, canvas, header_frame, datetime_label, size_button, color_button, auto_checkbutton, auto_var, settings, positions
+    try:
+        settings = open_settings(SETTINGS_NAME, SETTINGS_DEFAULTS, legacy=read_legacy_settings())
+        # 以前は設定ファイルにホストごとに保存していた位置を、記録が無いときの初期値にする
+        positions = open_positions(SETTINGS_NAME, legacy=settings.get_host('position'))
+        restore_settings()
+
+        # Tkinterのウィンドウを作成
+        root = tk.Tk()
+        root.title("アナログ時計")
+        apply_factor_settings()
+        restore_position(root)
+        root.protocol("WM_DELETE_WINDOW", on_close)  # 終了時処理の設定
+
+        # ヘッダフレーム（ボタン/デジタル時計）
+        header_frame = tk.Frame(root)
+        header_frame.pack(side='top', anchor='nw')
+
+        # デジタル日時ラベル（左端）
+        datetime_font_size = max(10, int(12 * factor))
+        datetime_label = tk.Label(header_frame, text="", font=("Helvetica", datetime_font_size))
+        datetime_label.pack(side='left')
+
+        size_button = tk.Button(header_frame, text="サイズ変更", command=toggle_clock_size)
+        size_button.pack(side='left')
+
+        color_button = tk.Button(header_frame, text="カラー変更", command=toggle_theme)
+        color_button.pack(side='left')
+
+        # Autoトグル（カラー変更ボタンの右側）
+        auto_var = tk.BooleanVar(value=is_auto_theme)
+        auto_checkbutton = tk.Checkbutton(header_frame, text="Auto", variable=auto_var, command=on_auto_toggle)
+        auto_checkbutton.pack(side='left')
+
+        # 時計の文字盤を描画
+        canvas = tk.Canvas(root, width=400, height=400, bg=get_theme_colors()['canvas_bg'])
+        canvas.pack(expand=True, fill=tk.BOTH)
+
+        # テーマ適用 & デジタル日時開始（タイトルバーも反映）
+        apply_theme_styles()
+        # テーマ適用 & デジタル日時開始（タイトルバーも反映）
+        apply_theme_styles()
+        draw_clock(canvas)
+        update_datetime_label()
 
-    # Autoトグル（カラー変更ボタンの右側）
-    auto_var = tk.BooleanVar(value=is_auto_theme)
-    auto_checkbutton = tk.Checkbutton(header_frame, text="Auto", variable=auto_var, command=on_auto_toggle)
-    auto_checkbutton.pack(side='left')
+        # Autoモードの初回適用とスケジューリング
+        apply_auto_theme_now()
+        schedule_auto_theme()
 
-    # 時計の文字盤を描画
-    canvas = tk.Canvas(root, width=400, height=400, bg=get_theme_colors()['canvas_bg'])
-    canvas.pack(expand=True, fill=tk.BOTH)
+        # 最小化/非表示の間は更新を止める
+        root.bind('<Unmap>', on_unmap)
+        root.bind('<Map>', on_map)
+        root.bind('<Configure>', on_configure)
 
-    # テーマ適用 & デジタル日時開始（タイトルバーも反映）
-    apply_theme_styles()
-    # テーマ適用 & デジタル日時開始（タイトルバーも反映）
-    apply_theme_styles()
-    draw_clock(canvas)
-    update_datetime_label()
+        root.mainloop()
 
-    # Autoモードの初回適用とスケジューリング
-    apply_auto_theme_now()
-    auto_theme_loop()
+    except Exception as e:
+        t, v, tb = sys.exc_info()
+        trace = traceback.format_exception(t, v, tb)
+        print(trace)
 
-    root.mainloop()
 
-except Exception as e:
-    t, v, tb = sys.exc_info()
-    trace = traceback.format_exception(t, v, tb)
-    print(trace)
+if __name__ == "__main__":
+    main()
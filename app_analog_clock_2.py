@@ -2,18 +2,39 @@
 # アプリ名: 0. アナログ時計2
 """PySide6 アナログ時計アプリ"""
 
+# 起動プロファイル用: モジュール読み込み開始時刻（他の import より前に測る）
+import time
+MODULE_LOAD_STARTED = time.perf_counter()
+
+import os
 import sys
 import math
-import time
+import argparse
+from collections import deque
 from pathlib import Path
 
-from PySide6.QtCore import Qt, QTimer, QPoint, QUrl
-from PySide6.QtGui import QPainter, QPen, QColor, QFont, QFontMetrics
+from PySide6.QtCore import Qt, QEvent, QObject, QTimer, QPoint, QPointF, QLineF, QRect, QRectF, QSize, QUrl, Signal
+from PySide6.QtGui import (
+    QGuiApplication, QPainter, QPen, QColor, QFont, QFontMetrics, QPixmap, QRegion, QStaticText, QTransform,
+    QKeySequence, QShortcut
+)
 from PySide6.QtWidgets import (
-    QApplication, QWidget, QMainWindow, QLabel, QPushButton,
-    QCheckBox, QHBoxLayout, QVBoxLayout, QLayout, QSlider
+    QApplication, QWidget, QMainWindow, QLabel, QPushButton, QSizePolicy,
+    QCheckBox, QHBoxLayout, QVBoxLayout, QGridLayout, QLayout, QSlider
 )
-from PySide6.QtMultimedia import QSoundEffect
+# QtMultimedia は重いバックエンドを読み込むため、秒針音を初めて有効にしたときに import する
+
+from clock_time import CADENCE_SECOND, DEFAULT_READOUT_FORMAT, ReadoutFormat, take_snapshot, cadence_key, format_readout
+from clock_theme import TIME_JUMP_THRESHOLD_S, THEME_FILE, is_dark_time, seconds_until_transition, load_theme_specs
+from clock_geometry import SECOND_STEPS, MINUTE_STEPS, HOUR_STEPS, dial_geometry
+from clock_engine import CHANGED_HANDS, ClockEngine
+from tick_sound import TickSoundParams, load_tick
+from clock_zones import parse_zone, load_zone_file
+from clock_settings import open_settings, read_legacy_settings
+from clock_positions import open_positions
+from clock_metrics import Metrics
+
+MODULE_LOAD_FINISHED = time.perf_counter()
 
 # ---------------------- 定数 ----------------------
 WINDOW_SIZE = 400
@@ -24,10 +45,76 @@ LENGTH_MINUTE_HAND = 150
 LENGTH_HOUR_HAND = 100
 NUMBER_DISTANCE = 155
 UPDATE_INTERVAL = 1000        # アナログ＆デジタル更新間隔
-AUTO_CHECK_INTERVAL_MS = 60000
+TICK_LATENESS_HISTORY = 300   # 直近何回分の発火遅れ(ms)を保持するか
 FONT_SIZE = 32
-FACTOR_FILE = Path("factor.txt")
+TICK_LENGTH_MAJOR = 10        # 5分毎の目盛りの長さ
+TICK_LENGTH_MINOR = 6
+# 針の (長さ, 太さ)。時・分・秒の順
+HAND_SPECS = (
+    (LENGTH_HOUR_HAND, 8),
+    (LENGTH_MINUTE_HAND, 5),
+    (LENGTH_SECOND_HAND, 2),
+)
+HAND_LENGTHS = tuple(length for length, _ in HAND_SPECS)
+HAND_DAMAGE_MARGIN = 2        # アンチエイリアス分の再描画余白
+# スムーズ（スイープ）モード
+SWEEP_FPS_LEVELS = (60, 30, 10)   # 段階的に下げるフレームレート
+SWEEP_STEPS = 3600                # スイープ時の秒針/分針の一周分割数（0.1度刻み）
+SWEEP_PAINT_BUDGET = 0.25         # 1フレーム間隔のうち描画に使ってよい割合
+SWEEP_HEADROOM = 0.5              # 上の段の予算のこの割合未満なら fps を上げる
+SWEEP_ADAPT_FRAMES = 30           # 何フレームごとに描画コストを評価するか
+PAINT_COST_HISTORY = 120          # 直近何フレーム分の描画時間(ms)を保持するか
+# デジタル表示
+READOUT_MS_INTERVAL_MS = 50       # ミリ秒表示時の更新間隔
+READOUT_WIDE_CHARS = "0123456789APM"  # 英数字はこの中で最も広い文字幅のセルに揃える
+# 文字盤キャッシュ（全 ClockWidget で共有。キー: 倍率, テーマ, デバイスピクセル比）
+# 自由サイズでは倍率ごとに別のキーになるため、枚数ではなく合計バイト数で上限を決める（古い順に捨てる）
+DIAL_CACHE = {}
+DIAL_CACHE_LIMIT_MB = 64
+# 針のスプライトアトラス（--hand-atlas。全 ClockWidget で共有。キー: 倍率, テーマ, デバイスピクセル比）
+HAND_ATLAS_CACHE = {}
+HAND_ATLAS_LIMIT_MB = 64          # アトラスの合計メモリ上限。1組で超える倍率/DPR では線の描画に戻す
+HAND_ATLAS_PAGE_SIZE = 2048       # スプライトを詰める1枚（QPixmap）の幅/高さ（デバイスピクセル）
+# 世界時計
+WALL_FACTOR = 0.4
+# 計測（--metrics または F3 で有効化）。F4 で JSON 出力、F6 で cProfile を一定時間取得
+METRICS_FILE = Path(__file__).parent / "clock_metrics.json"
+METRICS_PROFILE_FILE = Path(__file__).parent / "clock_profile.pstats"
+METRICS_PROFILE_SECONDS = 10
+HUD_FONT_PX = 11
+HUD_PADDING = 4
+# 自由サイズ: 倍率はウィジェットの短辺 / WINDOW_SIZE（任意の値）
+MIN_FACTOR = 0.5
+MAX_FACTOR = 4.0
+SIZE_PRESETS = (1.0, 1.5, 2.0, 2.5)  # 「サイズ変更」ボタンで巡回する倍率
+ZOOM_STEP = 1.1                      # Ctrl+ホイール1目盛りあたりの倍率
+RESIZE_SETTLE_MS = 150               # リサイズが止まってからこの時間後に文字盤/UI を作り直す
+UI_SCALE_STEP = 0.25                 # ボタン等のフォントはこの刻みで拡縮する
+UI_SCALE_HYSTERESIS = 0.05           # 刻みの境界をこれだけ越えるまで切り替えない（ヘッダ高さと時計サイズの振動を防ぐ）
+# 描画方式: QPainter（ClockWidget）/ Qt Quick シーングラフ（QuickClockWidget）
+RENDERER_PAINTER = "painter"
+RENDERER_QUICK = "quick"
+QUICK_QML_FILE = Path(__file__).parent / "clock_quick.qml"
+
+# 文字盤/針の座標表（論理座標 400x400。倍率は QPainter.scale で掛ける）
+GEOMETRY = dial_geometry(CENTER.x(), CENTER.y(), CLOCK_RADIUS, NUMBER_DISTANCE, TICK_LENGTH_MAJOR, TICK_LENGTH_MINOR)
+MAJOR_TICK_LINES = [QLineF(*GEOMETRY.major_ticks[i:i + 4]) for i in range(0, len(GEOMETRY.major_ticks), 4)]
+MINOR_TICK_LINES = [QLineF(*GEOMETRY.minor_ticks[i:i + 4]) for i in range(0, len(GEOMETRY.minor_ticks), 4)]
+# 設定（clock_settings で遅延・アトミックに保存。旧 factor.txt は初回のみ取り込む）
+SETTINGS_NAME = "app_analog_clock_2"
+SETTINGS_DEFAULTS = {
+    "factor": 1.0,
+    "theme": "light",
+    "auto_theme": True,
+    "tick_sound": False,
+    "volume": 50,
+    "always_on_top": False,
+}
 VOLUME_MAX_SCALE = 0.25
+# 秒針音の合成パラメータ（変えると別の音として tick_sounds/ にキャッシュされる）
+TICK_SOUND = TickSoundParams()
+TICK_AUDIO_LEAD_MS = 10       # 秒境界のこの時間だけ前に PCM を書き込む（出力遅延の補償）
+TICK_AUDIO_MAX_LATE_S = 0.5   # これ以上遅れた場合（スリープ復帰など）はその回のクリックを鳴らさない
 
 LIGHT_THEME = {
     "bg": "#ffffff",
@@ -43,108 +130,1103 @@ DARK_THEME = {
     "tick": "#bbbbbb",
     "second": "#ff4d4d"
 }
+# 自動テーマで使うテーマ名（themes.json で色を上書き可能）
+AUTO_LIGHT_THEME = "light"
+AUTO_DARK_THEME = "dark"
+
+# ---------------------- テーマ ----------------------
+class CompiledTheme:
+    """色定義から描画用の QColor/QPen を一度だけ作っておくテーマ。切替は参照の差し替えのみ"""
+    __slots__ = ("name", "spec", "bg", "number", "outline_pen", "major_tick_pen", "minor_tick_pen", "hand_pens")
+
+    def __init__(self, name, spec):
+        self.name = name
+        self.spec = dict(spec)
+        self.bg = QColor(spec["bg"])
+        self.number = QColor(spec["number"])
+        self.outline_pen = QPen(QColor(spec["line"]))
+        self.outline_pen.setWidth(3)
+        self.major_tick_pen = QPen(QColor(spec["tick"]))
+        self.major_tick_pen.setWidth(3)
+        self.minor_tick_pen = QPen(QColor(spec["tick"]))
+        self.minor_tick_pen.setWidth(1)
+        # 時・分・秒の順（HAND_SPECS と対応）
+        self.hand_pens = []
+        for (_, width), color in zip(HAND_SPECS, (spec["line"], spec["line"], spec["second"])):
+            pen = QPen(QColor(color))
+            pen.setWidth(width)
+            self.hand_pens.append(pen)
+
+
+def load_themes(path=THEME_FILE):
+    """組み込み（light/dark）＋テーマファイルのテーマをコンパイルして {名前: CompiledTheme} で返す"""
+    specs = load_theme_specs({AUTO_LIGHT_THEME: LIGHT_THEME, AUTO_DARK_THEME: DARK_THEME}, path,
+                             is_valid_color=QColor.isValidColorName)
+    return {name: CompiledTheme(name, spec) for name, spec in specs.items()}
+
+
+def build_stylesheet(themes):
+    """全テーマ分のルールを1つのスタイルシートにまとめる。
+    中央ウィジェットの動的プロパティ theme で切り替えるため、切替時に再解析は発生しない。
+    """
+    rules = []
+    for name, theme in themes.items():
+        c = theme.spec
+        scope = f'QWidget#central[theme="{name}"]'
+        rules += [
+            f"{scope} {{ background-color: {c['bg']}; color: {c['number']}; }}",
+            f"{scope} QLabel {{ color: {c['number']}; }}",
+            f"{scope} QCheckBox {{ color: {c['number']}; }}",
+            f"{scope} QPushButton {{ color: {c['number']}; border: 1px solid {c['tick']}; background-color: transparent; }}",
+            f"{scope} QSlider::groove:horizontal {{ background: {c['tick']}; height: 4px; border-radius: 2px; }}",
+            f"{scope} QSlider::handle:horizontal {{ background: {c['number']}; border: 1px solid {c['tick']}; width: 12px; margin: -6px 0; border-radius: 6px; }}",
+        ]
+    return "\n".join(rules)
+
+# ---------------------- 起動プロファイル ----------------------
+class StartupProfile:
+    """--profile-startup 用。各段階の経過時刻を記録し、最初のティック後に内訳を表示する"""
+
+    def __init__(self):
+        self.marks = [("start", MODULE_LOAD_STARTED), ("import", MODULE_LOAD_FINISHED)]
+
+    def mark(self, name):
+        self.marks.append((name, time.perf_counter()))
+
+    def report(self):
+        origin = self.marks[0][1]
+        previous = origin
+        print("[起動プロファイル]")
+        for name, at in self.marks[1:]:
+            print(f"  {name:<14s} +{(at - previous) * 1000:8.1f} ms  (累計 {(at - origin) * 1000:8.1f} ms)")
+            previous = at
+        try:
+            import resource
+            print(f"  peak RSS        {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss} KB")
+        except ImportError:
+            pass
+
+# ---------------------- 秒境界同期タイマー ----------------------
+class SecondAlignedTimer(QObject):
+    """実時間の境界（既定: 毎秒 .000）に合わせて timeout を発火するタイマー。
+
+    連続動作の QTimer は起動時刻基準でずれていくため、単発の PreciseTimer を
+    毎回「次の境界」までの残り時間で張り直す。遅れて起きた場合も次の境界を
+    現在時刻から求め直すので誤差は蓄積しない。各発火の遅れは lateness_ms に残す。
+    """
+    timeout = Signal()
+
+    def __init__(self, parent=None, interval_ms=UPDATE_INTERVAL):
+        super().__init__(parent)
+        self.interval_ms = interval_ms
+        self.lateness_ms = deque(maxlen=TICK_LATENESS_HISTORY)
+        self.metrics = None  # clock_metrics.Metrics（計測有効時のみ）
+        self._target = None
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setTimerType(Qt.PreciseTimer)
+        self._timer.timeout.connect(self._on_timeout)
+
+    def start(self):
+        self._arm(time.time())
+
+    def stop(self):
+        self._timer.stop()
+        self._target = None
+
+    def isActive(self):
+        return self._timer.isActive()
+
+    def _arm(self, now):
+        interval = self.interval_ms / 1000.0
+        self._target = (math.floor(now / interval) + 1) * interval
+        self._timer.start(max(0, math.ceil((self._target - now) * 1000)))
+
+    def _on_timeout(self):
+        now = time.time()
+        if now < self._target:
+            # 早く起きた場合は境界まで待ち直す（前の秒を表示しないため）
+            self._timer.start(max(0, math.ceil((self._target - now) * 1000)))
+            return
+        late_ms = (now - self._target) * 1000
+        self.lateness_ms.append(late_ms)
+        if self.metrics is not None:
+            self.metrics.record("tick_late_ms", late_ms)
+        self._arm(now)
+        self.timeout.emit()
+
+    def max_lateness_ms(self):
+        return max(self.lateness_ms, default=0.0)
+
+# ---------------------- 共有ティック配信 ----------------------
+class TickBus(QObject):
+    """時刻を1ティックにつき一度だけ取得し、購読者へ同じスナップショットを配信する。
+
+    タイマーは1つだけ持ち、購読者は秒/分/時の周期を指定できる。
+    前回ティックからの実時間の飛び（スリープ復帰・時計変更・停止からの再開）は time_jumped で通知する。
+    """
+    time_jumped = Signal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.snapshot = take_snapshot()
+        self._subscribers = []  # [callback, cadence, 前回配信時のキー]
+        self.metrics = None
+        self.timer = SecondAlignedTimer(self)
+        self.timer.timeout.connect(self.dispatch)
+
+    def subscribe(self, callback, cadence=CADENCE_SECOND):
+        self._subscribers.append([callback, cadence, cadence_key(self.snapshot, cadence)])
+
+    def unsubscribe(self, callback):
+        self._subscribers = [s for s in self._subscribers if s[0] != callback]
+
+    def start(self):
+        self.timer.start()
+
+    def stop(self):
+        self.timer.stop()
+
+    def resume(self):
+        # 停止中に進んだ時刻を即座に配信してから秒境界の同期を再開する
+        self.dispatch(from_timer=False)
+        self.timer.start()
+
+    def set_metrics(self, metrics):
+        self.metrics = metrics
+        self.timer.metrics = metrics
+
+    def dispatch(self, from_timer=True):
+        snapshot = take_snapshot()
+        elapsed = snapshot.epoch - self.snapshot.epoch
+        step = int(snapshot.epoch) - int(self.snapshot.epoch)
+        self.snapshot = snapshot
+        jumped = elapsed < 0 or elapsed > TIME_JUMP_THRESHOLD_S
+        if jumped:
+            self.time_jumped.emit()
+        if self.metrics is not None and from_timer:
+            # 1秒ティックで表示上の秒が飛んだ/重複した回数（時計の飛びは別に数える）
+            if jumped:
+                self.metrics.count("time_jumps")
+            elif step == 0:
+                self.metrics.count("duplicated_seconds")
+            elif step > 1:
+                self.metrics.count("skipped_seconds", step - 1)
+        for entry in list(self._subscribers):
+            key = cadence_key(snapshot, entry[1])
+            if key != entry[2]:
+                entry[2] = key
+                entry[0](snapshot)
+
+# ---------------------- 秒針音（低遅延出力） ----------------------
+class TickAudioEngine(QObject):
+    """秒境界に合わせてクリックを鳴らす音声出力。
+
+    QAudioSink を push モードで開いたままにし、キャッシュ済みの PCM を秒境界の
+    TICK_AUDIO_LEAD_MS 前に書き込む。書き込みは専用の単発 PreciseTimer で行い、
+    予定時刻からの起床遅れ + 既にキューにあった音声の再生待ちを、秒境界に対する
+    推定誤差として schedule_error_ms に記録する。
+    """
+
+    def __init__(self, parent=None, params=TICK_SOUND):
+        super().__init__(parent)
+        # QtMultimedia は有効化時にのみ読み込む
+        from PySide6.QtMultimedia import QAudioFormat, QAudioSink, QMediaDevices
+        _, self._pcm = load_tick(params)
+        fmt = QAudioFormat()
+        fmt.setSampleRate(params.sample_rate)
+        fmt.setChannelCount(1)
+        fmt.setSampleFormat(QAudioFormat.Int16)
+        device = QMediaDevices.defaultAudioOutput()
+        if device.isNull() or not device.isFormatSupported(fmt):
+            raise RuntimeError("no audio output supporting 16bit mono")
+        self._sink = QAudioSink(device, fmt, self)
+        # クリック2回分のバッファ（_pcm はバイト数）。前のクリックが再生し切れていなくても
+        # 次の1回分を一度に書き込める最小限の大きさ（大きいほど遅延が増える）
+        self._sink.setBufferSize(len(self._pcm) * 2)
+        self._bytes_per_ms = params.sample_rate * 2 / 1000.0
+        self._io = None
+        self._fire_at = None
+        self.schedule_error_ms = deque(maxlen=TICK_LATENESS_HISTORY)
+        self.metrics = None
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setTimerType(Qt.PreciseTimer)
+        self._timer.timeout.connect(self._on_timeout)
+
+    def start(self):
+        if self._io is None:
+            self._io = self._sink.start()
+        self._arm(time.time())
+
+    def stop(self):
+        self._timer.stop()
+        self._fire_at = None
+        if self._io is not None:
+            self._sink.stop()
+            self._io = None
+
+    def isActive(self):
+        return self._timer.isActive()
+
+    def set_volume(self, volume):
+        self._sink.setVolume(volume)
+
+    def max_error_ms(self):
+        return max(self.schedule_error_ms, default=0.0)
+
+    def _arm(self, now):
+        lead = TICK_AUDIO_LEAD_MS / 1000.0
+        self._fire_at = math.floor(now + lead) + 1 - lead
+        self._timer.start(max(0, math.ceil((self._fire_at - now) * 1000)))
+
+    def _on_timeout(self):
+        now = time.time()
+        if now < self._fire_at:
+            self._timer.start(max(0, math.ceil((self._fire_at - now) * 1000)))
+            return
+        late_s = now - self._fire_at
+        if late_s < TICK_AUDIO_MAX_LATE_S and self._io is not None:
+            queued_ms = (self._sink.bufferSize() - self._sink.bytesFree()) / self._bytes_per_ms
+            self._io.write(self._pcm)
+            error_ms = late_s * 1000 + queued_ms
+            self.schedule_error_ms.append(error_ms)
+            if self.metrics is not None:
+                self.metrics.record("audio_error_ms", error_ms)
+        self._arm(now)
+
+# ---------------------- デジタル表示 ----------------------
+class DigitalReadout:
+    """時計ウィジェット上に描くデジタル表示。
+    文字ごとの QStaticText をキャッシュし、固定幅のセルに並べる。文字列を更新すると
+    変化したセルの領域だけを返すので、呼び出し側はそこだけを再描画する（レイアウト計算なし）。
+    """
+    def __init__(self):
+        self.font = QFont()
+        self.origin = QPoint(0, 0)
+        self.text = ""
+        self._glyphs = {}    # 文字 -> QStaticText
+        self._cells = []     # 各文字のセル (x, 幅)。origin からの相対
+        self._shape = None   # セル配置を決める文字列の形（英数字か区切り文字か）
+        self._wide = 0
+        self._height = 0
+        self._ascent_pad = 0
+
+    def set_font(self, font, origin):
+        """フォント/位置の変更。旧領域と新領域の和を返す"""
+        region = QRegion(self.rect())
+        self.font = QFont(font)
+        self.origin = QPoint(origin)
+        metrics = QFontMetrics(self.font)
+        self._wide = max(metrics.horizontalAdvance(c) for c in READOUT_WIDE_CHARS)
+        self._height = metrics.height()
+        self._glyphs.clear()
+        self._shape = None
+        self._layout(self.text)
+        return region + QRegion(self.rect())
+
+    def set_text(self, text):
+        """表示文字列の更新。変化したセルの領域を返す（変化なしなら空）"""
+        if text == self.text:
+            return QRegion()
+        old_text = self.text
+        old_rect = self.rect()
+        self.text = text
+        if self._layout(text):
+            return QRegion(old_rect) + QRegion(self.rect())
+        region = QRegion()
+        for i, (old, new) in enumerate(zip(old_text, text)):
+            if old != new:
+                region += self.cell_rect(i)
+        return region
+
+    def _layout(self, text):
+        """セル配置を計算し直したら True。書式が同じなら桁の位置は変わらない"""
+        shape = tuple(True if c.isalnum() else c for c in text)
+        if shape == self._shape:
+            return False
+        self._shape = shape
+        metrics = QFontMetrics(self.font)
+        self._cells = []
+        x = 0
+        for c in text:
+            width = self._wide if c.isalnum() else metrics.horizontalAdvance(c)
+            self._cells.append((x, width))
+            x += width
+        return True
+
+    def cell_rect(self, i):
+        x, width = self._cells[i]
+        return QRect(self.origin.x() + x, self.origin.y(), width, self._height)
+
+    def rect(self):
+        if not self._cells:
+            return QRect()
+        x, width = self._cells[-1]
+        return QRect(self.origin.x(), self.origin.y(), x + width, self._height)
+
+    def glyph(self, c):
+        glyph = self._glyphs.get(c)
+        if glyph is None:
+            glyph = QStaticText(c)
+            glyph.setTextFormat(Qt.PlainText)
+            glyph.prepare(QTransform(), self.font)
+            self._glyphs[c] = glyph
+        return glyph
+
+    def draw(self, painter, color, region):
+        """region と重なるセルだけを描く"""
+        if not region.intersects(self.rect()):
+            return
+        painter.setFont(self.font)
+        painter.setPen(color)
+        for i, c in enumerate(self.text):
+            rect = self.cell_rect(i)
+            if c == " " or not region.intersects(rect):
+                continue
+            glyph = self.glyph(c)
+            # セル内で中央寄せ（幅の違う文字でも桁位置がずれない）
+            painter.drawStaticText(QPointF(rect.x() + (rect.width() - glyph.size().width()) / 2, rect.y()), glyph)
+
+# ---------------------- 針のスプライトアトラス ----------------------
+class HandAtlas:
+    """針ごと・取り得る角度ごと（時 720 / 分 60 / 秒 60）にアンチエイリアス済みの針を描いておくスプライト集。
+    1フレームの描画は文字盤1枚＋針3本の drawPixmap だけになり、線のラスタライズをしない。
+    スプライトは針の外接矩形（デバイスピクセルに揃えたもの）で、高さ順にページへ棚詰めする。
+    """
+    __slots__ = ("dpr", "scale", "steps", "sprites", "page_width", "page_heights", "pages", "nbytes")
+
+    def __init__(self, factor, dpr):
+        """配置だけを決める（メモリの見積もり用）。描画は render() で行う"""
+        self.dpr = dpr
+        self.scale = factor * dpr
+        self.steps = (HOUR_STEPS, MINUTE_STEPS, SECOND_STEPS)
+        cx, cy = CENTER.x(), CENTER.y()
+        boxes = []
+        for hand, ((length, width), steps) in enumerate(zip(HAND_SPECS, self.steps)):
+            pad = width / 2 + HAND_DAMAGE_MARGIN
+            for index in range(steps):
+                x, y = GEOMETRY.hand_end(length, steps, index)
+                # 文字盤左上を原点とするデバイスピクセル座標
+                x0 = math.floor((min(cx, x) - pad) * self.scale)
+                y0 = math.floor((min(cy, y) - pad) * self.scale)
+                x1 = math.ceil((max(cx, x) + pad) * self.scale)
+                y1 = math.ceil((max(cy, y) + pad) * self.scale)
+                boxes.append((hand, index, x0, y0, x1 - x0, y1 - y0))
+        boxes.sort(key=lambda box: -box[5])
+        self.page_width = max([HAND_ATLAS_PAGE_SIZE] + [box[4] for box in boxes])
+        page_limit = max([HAND_ATLAS_PAGE_SIZE] + [box[5] for box in boxes])
+        # sprites[針][インデックス] = (ページ, ページ内の x, y, 幅, 高さ, 文字盤上の x0, y0)
+        self.sprites = [[None] * steps for steps in self.steps]
+        self.page_heights = [0]
+        x = y = shelf = 0
+        for hand, index, x0, y0, w, h in boxes:
+            if x + w > self.page_width:
+                x, y, shelf = 0, y + shelf, 0
+            if y + h > page_limit:
+                self.page_heights.append(0)
+                x = y = shelf = 0
+            page = len(self.page_heights) - 1
+            self.sprites[hand][index] = (page, x, y, w, h, x0, y0)
+            x += w
+            shelf = max(shelf, h)
+            self.page_heights[page] = max(self.page_heights[page], y + h)
+        self.nbytes = self.page_width * sum(self.page_heights) * 4
+        self.pages = None
+
+    def render(self, theme):
+        self.pages = []
+        for height in self.page_heights:
+            page = QPixmap(self.page_width, height)
+            page.fill(Qt.transparent)
+            self.pages.append(page)
+        painters = [QPainter(page) for page in self.pages]
+        for painter in painters:
+            painter.setRenderHint(QPainter.Antialiasing)
+        center = QPointF(CENTER)
+        for hand, ((length, _), steps, pen) in enumerate(zip(HAND_SPECS, self.steps, theme.hand_pens)):
+            for index, (page, sx, sy, w, h, x0, y0) in enumerate(self.sprites[hand]):
+                painter = painters[page]
+                # 隣のスプライトへはみ出さないようにスロットで切り抜き、文字盤座標のまま描く
+                painter.resetTransform()
+                painter.setClipRect(sx, sy, w, h)
+                painter.translate(sx - x0, sy - y0)
+                painter.scale(self.scale, self.scale)
+                painter.setPen(pen)
+                painter.drawLine(center, QPointF(*GEOMETRY.hand_end(length, steps, index)))
+        for painter in painters:
+            painter.end()
+
+    def draw(self, painter, hand, position, origin):
+        """座標変換なしの painter に針を1枚転送する。アトラスに無い分割数（スイープ）なら False"""
+        index, steps = position
+        if steps != self.steps[hand]:
+            return False
+        page, sx, sy, w, h, x0, y0 = self.sprites[hand][index % steps]
+        d = self.dpr
+        if d == 1:
+            # 等倍なら整数座標の転送（拡縮・補間なしの経路になる）
+            painter.drawPixmap(origin.x() + x0, origin.y() + y0, self.pages[page], sx, sy, w, h)
+        else:
+            painter.drawPixmap(QRectF(origin.x() + x0 / d, origin.y() + y0 / d, w / d, h / d),
+                               self.pages[page], QRectF(sx, sy, w, h))
+        return True
+
 
 # ---------------------- アナログ時計ウィジェット ----------------------
+def dial_side_for(width, height):
+    """ウィジェットの大きさ → 文字盤の1辺。短辺を使い、MAX_FACTOR を超えたら余りは背景にする"""
+    return min(width, height, round(WINDOW_SIZE * MAX_FACTOR))
+
+
+def pixmap_nbytes(pixmap):
+    return pixmap.width() * pixmap.height() * pixmap.depth() // 8
+
+
 class ClockWidget(QWidget):
-    def __init__(self, parent=None, factor=1.0):
+    def __init__(self, parent=None, factor=1.0, zone=None):
         super().__init__(parent)
+        # 倍率は実際の大きさ（短辺）から決まる。factor は推奨サイズ（sizeHint）として使う
         self.factor = factor
-        self.theme = LIGHT_THEME
-        self.setMinimumSize(WINDOW_SIZE, WINDOW_SIZE)
-        self.setFixedSize(int(WINDOW_SIZE * factor), int(WINDOW_SIZE * factor))
-
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.update)
-        self.timer.start(UPDATE_INTERVAL)
+        self.preferred_factor = factor
+        self._origin = QPoint(0, 0)  # 正方形の文字盤の左上（ウィジェットが正方形でない場合は中央寄せ）
+        # リサイズ中は既存の文字盤を拡縮して描き、止まってから一度だけ鮮明に作り直す
+        self._dial_settle_timer = QTimer(self)
+        self._dial_settle_timer.setSingleShot(True)
+        self._dial_settle_timer.setInterval(RESIZE_SETTLE_MS)
+        self._dial_settle_timer.timeout.connect(self.update)
+        self.zone = zone  # clock_zones.ZoneOffsets。None ならローカル時刻
+        self.theme = CompiledTheme(AUTO_LIGHT_THEME, LIGHT_THEME)
+        # 文字盤（外周・目盛・数字）は静的なのでオフスクリーンにキャッシュし、毎秒は針だけ描く
+        self._dial_pixmap = None
+        self._dial_key = None
+        # 針のスプライトアトラス（set_hand_atlas で有効化。上限を超えるキーは None で線の描画）
+        self.hand_atlas_limit_mb = 0
+        self._hand_atlas = None
+        self._hand_atlas_key = None
+        # 針の位置/先端座標/変化は clock_engine で求め、ここでは最新のフレームを描くだけにする。
+        # on_tick で更新し、変化した針の領域だけを再描画する
+        self.engine = ClockEngine(GEOMETRY, HAND_LENGTHS, self.theme)
+        self.frame = self.engine.frame(self.local_snapshot(take_snapshot()))
+        # 再描画ピクセル数と針のフレーム数の計測（1秒窓）。デジタル表示/HUD だけの再描画はフレームに数えない
+        self.repainted_pixels_per_second = 0
+        self.achieved_fps = 0.0
+        self._damage_pixels = 0
+        self._damage_frames = 0
+        self._hands_pending = False  # 針の再描画を要求済みで、まだ描いていない
+        self._damage_window_start = time.monotonic()
+        # 描画コスト(ms)とスムーズモードの状態
+        self.paint_ms = deque(maxlen=PAINT_COST_HISTORY)
+        self.metrics = None
+        # 計測オーバーレイ（None なら非表示）
+        self.hud_lines = None
+        self._hud_rect = QRect()
+        self._hud_font = QFont()
+        self._hud_font.setPixelSize(HUD_FONT_PX)
+        self._hud_font.setStyleHint(QFont.Monospace)
+        self._hud_font.setFamily("monospace")
+        self.on_first_paint = None  # 最初の描画完了時に一度だけ呼ぶ（起動プロファイル用）
+        self.sweep_fps = 0          # 0 は1秒ステップ（ティック配信で駆動）
+        self.sweep_max_fps = 0
+        self._frames_since_adapt = 0
+        self._frame_timer = QTimer(self)
+        self._frame_timer.setTimerType(Qt.PreciseTimer)
+        self._frame_timer.timeout.connect(self.on_frame)
+        # デジタル表示（ミリ秒表示のときだけ専用タイマーで更新する）
+        self.readout = DigitalReadout()
+        self.readout_format = DEFAULT_READOUT_FORMAT
+        self._readout_timer = QTimer(self)
+        self._readout_timer.setTimerType(Qt.PreciseTimer)
+        self._readout_timer.timeout.connect(self.on_readout_frame)
+        # キャッシュした文字盤で全面を塗るため、背景の事前消去は不要
+        self.setAttribute(Qt.WA_OpaquePaintEvent)
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+        minimum = int(WINDOW_SIZE * min(factor, MIN_FACTOR))
+        self.setMinimumSize(minimum, minimum)
 
     def set_theme(self, theme):
+        # 背景は文字盤キャッシュに含めて描くため、スタイルシートは使わない
         self.theme = theme
-        self.setStyleSheet(f"background-color:{theme['bg']}")
+        self.engine.set_theme(theme)
+        self.invalidate_dial()
         self.update()
 
     def resize_by_factor(self, factor):
-        self.factor = factor
-        size = int(WINDOW_SIZE * factor)
-        self.setFixedSize(size, size)
+        """推奨サイズを変える（実際の大きさはレイアウト/ウィンドウ側で決まる）"""
+        self.preferred_factor = factor
+        self.updateGeometry()
+
+    def sizeHint(self):
+        size = round(WINDOW_SIZE * self.preferred_factor)
+        return QSize(size, size)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        side = self.dial_side()
+        # 文字盤の位置は整数ピクセルに揃える（半端な位置へ転送するとぼやけるため）
+        self._origin = QPoint((self.width() - side) // 2, (self.height() - side) // 2)
+        factor = side / WINDOW_SIZE
+        if factor != self.factor:
+            self.factor = factor
+            self._dial_settle_timer.start()
         self.update()
 
-    def paintEvent(self, event):
-        painter = QPainter(self)
+    def dial_side(self):
+        return dial_side_for(self.width(), self.height())
+
+    # -------- 針のスプライトアトラス --------
+    def set_hand_atlas(self, limit_mb=HAND_ATLAS_LIMIT_MB):
+        """limit_mb > 0 で針をアトラスから転送する（0 で無効）。上限を超える倍率/DPR では線で描く"""
+        self.hand_atlas_limit_mb = limit_mb
+        self._hand_atlas = None
+        self._hand_atlas_key = None
+        self.update()
+
+    def hand_mode(self):
+        if not self.hand_atlas_limit_mb:
+            return "stroke"
+        return "atlas" if self._hand_atlas is not None else "stroke(fallback)"
+
+    def hand_atlas(self):
+        key = (self.factor, self.theme, self.devicePixelRatioF())
+        if self._hand_atlas_key == key:
+            return self._hand_atlas
+        if self._dial_settle_timer.isActive():
+            return None  # リサイズ中は線で描き、止まってから作る
+        if key in HAND_ATLAS_CACHE:
+            atlas = HAND_ATLAS_CACHE[key]
+        else:
+            atlas = HandAtlas(key[0], key[2])
+            limit = self.hand_atlas_limit_mb * 2**20
+            if atlas.nbytes > limit:
+                print(f"[針アトラス] {atlas.nbytes / 2**20:.1f}MB > {self.hand_atlas_limit_mb}MB のため線で描画します"
+                      f"（倍率 {key[0]:.2f}, DPR {key[2]}）")
+                atlas = None
+            else:
+                # 合計が上限に収まるまで古いものから捨てる
+                while HAND_ATLAS_CACHE and sum(a.nbytes for a in HAND_ATLAS_CACHE.values() if a) + atlas.nbytes > limit:
+                    del HAND_ATLAS_CACHE[next(iter(HAND_ATLAS_CACHE))]
+                started = time.perf_counter()
+                atlas.render(self.theme)
+                if self.metrics is not None:
+                    self.metrics.record("hand_atlas_build_ms", (time.perf_counter() - started) * 1000)
+                    self.metrics.count("hand_atlas_builds")
+            HAND_ATLAS_CACHE[key] = atlas
+        self._hand_atlas = atlas
+        self._hand_atlas_key = key
+        return atlas
+
+    # -------- 文字盤キャッシュ --------
+    def invalidate_dial(self):
+        self._dial_pixmap = None
+        self._dial_key = None
+
+    def dial_pixmap(self):
+        # キー: (倍率, テーマ, デバイスピクセル比)。画面移動で DPR が変わった場合も作り直す。
+        # 同じキーの文字盤は全ウィジェットで共有する（世界時計で数十個並べても1枚）
+        dpr = self.devicePixelRatioF()
+        key = (self.factor, self.theme, dpr)
+        if self._dial_pixmap is None or self._dial_key != key:
+            if self._dial_pixmap is not None and self._dial_key[1] is self.theme and self._dial_settle_timer.isActive():
+                # リサイズ中: 作り直さず前の文字盤を拡縮して使う（止まった後に鮮明に描き直す）
+                return self._dial_pixmap
+            pixmap = DIAL_CACHE.pop(key, None)
+            if pixmap is None:
+                pixmap = self.render_dial(dpr)
+                # 合計が上限に収まるまで古いものから捨てる（使用中のウィジェットは自分の参照を持ち続ける）
+                limit = DIAL_CACHE_LIMIT_MB * 2**20 - pixmap_nbytes(pixmap)
+                while DIAL_CACHE and sum(pixmap_nbytes(p) for p in DIAL_CACHE.values()) > limit:
+                    del DIAL_CACHE[next(iter(DIAL_CACHE))]
+            DIAL_CACHE[key] = pixmap  # 末尾（最近使ったもの）へ
+            self._dial_pixmap = pixmap
+            self._dial_key = key
+        return self._dial_pixmap
+
+    def render_dial(self, dpr):
+        size = round(WINDOW_SIZE * self.factor)
+        pixmap = QPixmap(max(1, round(size * dpr)), max(1, round(size * dpr)))
+        pixmap.setDevicePixelRatio(dpr)
+        pixmap.fill(self.theme.bg)
+
+        painter = QPainter(pixmap)
         painter.setRenderHint(QPainter.Antialiasing)
         # factor に基づきスケール（描画とウィジェットサイズの両方で一貫）
         painter.scale(self.factor, self.factor)
 
-        pen = QPen(QColor(self.theme["line"]))
-        pen.setWidth(3)
-        painter.setPen(pen)
+        painter.setPen(self.theme.outline_pen)
         painter.drawEllipse(CENTER, CLOCK_RADIUS, CLOCK_RADIUS)
 
-        # 目盛り（秒/分）を描画（60分割。5分毎は長く太く）
-        tick_pen = QPen(QColor(self.theme["tick"]))
-        for i in range(60):
-            is_five = (i % 5 == 0)
-            tick_len = 10 if is_five else 6
-            tick_width = 3 if is_five else 1
-            tick_pen.setWidth(tick_width)
-            painter.setPen(tick_pen)
-            angle = math.radians(i * 6)
-            # Qtの座標系は右が+X、下が+Y。
-            # 円周上の点: (cx + r*cos, cy + r*sin)
-            start_x = CENTER.x() + (CLOCK_RADIUS - tick_len) * math.cos(angle)
-            start_y = CENTER.y() + (CLOCK_RADIUS - tick_len) * math.sin(angle)
-            end_x = CENTER.x() + CLOCK_RADIUS * math.cos(angle)
-            end_y = CENTER.y() + CLOCK_RADIUS * math.sin(angle)
-            painter.drawLine(int(start_x), int(start_y), int(end_x), int(end_y))
-
-        painter.setPen(QColor(self.theme["number"]))
+        # 目盛り（秒/分）を描画（60分割。5分毎は長く太く）。太さごとに一括描画
+        painter.setPen(self.theme.major_tick_pen)
+        painter.drawLines(MAJOR_TICK_LINES)
+        painter.setPen(self.theme.minor_tick_pen)
+        painter.drawLines(MINOR_TICK_LINES)
+
+        painter.setPen(self.theme.number)
         font = QFont("Helvetica", FONT_SIZE)
         painter.setFont(font)
         metrics = painter.fontMetrics()
         for i in range(1, 13):
-            angle = math.radians(i * 30 - 90)
-            x = CENTER.x() + NUMBER_DISTANCE * math.cos(angle)
-            y = CENTER.y() + NUMBER_DISTANCE * math.sin(angle)
+            x, y = GEOMETRY.number(i)
             text = str(i)
             w = metrics.horizontalAdvance(text)
             h = metrics.height()
             # 中心 (x,y) にテキストを配置するため、左上原点を補正
             painter.drawText(int(x - w/2), int(y + h/2 - metrics.descent()), text)
+        painter.end()
+        return pixmap
+
+    # -------- スムーズ（スイープ）モード --------
+    def set_sweep(self, fps):
+        """fps > 0 で秒針/分針を連続的に動かす。描画コストに応じて SWEEP_FPS_LEVELS 内で自動調整"""
+        if fps and fps > 0:
+            self.sweep_max_fps = fps
+            self._set_sweep_fps(fps)
+            self.on_frame()
+        else:
+            self.sweep_fps = 0
+            self.sweep_max_fps = 0
+            self._frame_timer.stop()
+            self.show_frame(self.engine.frame(self.local_snapshot(take_snapshot())))
+
+    def suspend(self):
+        self._frame_timer.stop()
+        self._readout_timer.stop()
+
+    def resume(self):
+        if self.sweep_fps:
+            self._set_sweep_fps(self.sweep_fps)
+            self.on_frame()
+        if self.readout_format.show_ms:
+            self._readout_timer.start(READOUT_MS_INTERVAL_MS)
+            self.on_readout_frame()
+
+    def _set_sweep_fps(self, fps):
+        self.sweep_fps = fps
+        self._frames_since_adapt = 0
+        self._frame_timer.start(max(1, round(1000 / fps)))
+
+    def on_frame(self):
+        self.show_frame(self.engine.frame(self.local_snapshot(take_snapshot()), SWEEP_STEPS))
+        self._frames_since_adapt += 1
+        if self._frames_since_adapt >= SWEEP_ADAPT_FRAMES:
+            self._adapt_sweep_fps()
+
+    def _adapt_sweep_fps(self):
+        self._frames_since_adapt = 0
+        if not self.paint_ms:
+            return
+        recent = list(self.paint_ms)[-SWEEP_ADAPT_FRAMES:]
+        cost = sum(recent) / len(recent)
+        # 指定の fps を上限に、それより低い段階へ下げる（指定が段階に無い値でも上限はその値）
+        levels = [self.sweep_max_fps] + [f for f in SWEEP_FPS_LEVELS if f < self.sweep_max_fps]
+        idx = levels.index(self.sweep_fps)
+        new_fps = self.sweep_fps
+        if cost > SWEEP_PAINT_BUDGET * 1000 / self.sweep_fps and idx + 1 < len(levels):
+            new_fps = levels[idx + 1]
+        elif idx > 0 and cost < SWEEP_PAINT_BUDGET * 1000 / levels[idx - 1] * SWEEP_HEADROOM:
+            new_fps = levels[idx - 1]
+        if new_fps != self.sweep_fps:
+            print(f"[スムーズ] {self.sweep_fps}fps -> {new_fps}fps (paint={cost:.2f}ms, achieved={self.achieved_fps:.1f}fps)")
+            self._set_sweep_fps(new_fps)
+
+    # -------- デジタル表示 --------
+    def set_readout_format(self, fmt):
+        self.readout_format = fmt
+        if fmt.show_ms:
+            self._readout_timer.start(READOUT_MS_INTERVAL_MS)
+        else:
+            self._readout_timer.stop()
+        self.show_time(take_snapshot())
+
+    def set_readout_font(self, font, origin):
+        self.update(self.readout.set_font(font, origin))
+
+    def show_time(self, snapshot):
+        snapshot = self.local_snapshot(snapshot)
+        region = self.readout.set_text(format_readout(snapshot.epoch, self.readout_format, snapshot.local))
+        if not region.isEmpty():
+            self.update(region)
+
+    def on_readout_frame(self):
+        self.show_time(take_snapshot())
+
+    # -------- 計測オーバーレイ --------
+    def set_hud(self, lines):
+        """lines: 表示する文字列のリスト（None で非表示）。旧/新の矩形だけを再描画する"""
+        region = QRegion(self._hud_rect)
+        self.hud_lines = lines
+        if lines:
+            metrics = QFontMetrics(self._hud_font)
+            width = max(metrics.horizontalAdvance(line) for line in lines) + HUD_PADDING * 2
+            height = metrics.height() * len(lines) + HUD_PADDING * 2
+            self._hud_rect = QRect(HUD_PADDING, self.height() - height - HUD_PADDING, width, height)
+        else:
+            self._hud_rect = QRect()
+        self.update(region + QRegion(self._hud_rect))
+
+    def draw_hud(self, painter):
+        background = QColor(self.theme.bg)
+        background.setAlpha(220)
+        painter.fillRect(self._hud_rect, background)
+        painter.setFont(self._hud_font)
+        painter.setPen(self.theme.number)
+        metrics = QFontMetrics(self._hud_font)
+        y = self._hud_rect.y() + HUD_PADDING + metrics.ascent()
+        for line in self.hud_lines:
+            painter.drawText(self._hud_rect.x() + HUD_PADDING, y, line)
+            y += metrics.height()
+
+    def paint_cost_ms(self):
+        return sum(self.paint_ms) / len(self.paint_ms) if self.paint_ms else 0.0
+
+    def paintEvent(self, event):
+        started = time.perf_counter()
+        self._count_repainted_pixels(event.region())
+        painter = QPainter(self)
+        side = self.dial_side()
+        dial = self.dial_pixmap()
+        target = QRect(self._origin, QSize(side, side))
+        if round(dial.width() / dial.devicePixelRatio()) != side:
+            painter.setRenderHint(QPainter.SmoothPixmapTransform)  # リサイズ中の一時的な拡縮
+        painter.drawPixmap(target, dial)
+        if side != self.width() or side != self.height():
+            # 正方形の外側（縦長/横長のウィンドウ）は背景色で塗る
+            painter.setClipRegion(event.region() - QRegion(target))
+            painter.fillRect(self.rect(), self.theme.bg)
+            painter.setClipping(False)
+        painter.setRenderHint(QPainter.Antialiasing)
+        atlas = self.hand_atlas() if self.hand_atlas_limit_mb else None
+        # 線で描く針は文字盤座標（原点へ移動して倍率を掛ける）、アトラスの針は座標変換なしで転送する
+        dial_transform = QTransform.fromTranslate(self._origin.x(), self._origin.y()).scale(self.factor, self.factor)
+        center = QPointF(CENTER)
+        for hand, (end, pen) in enumerate(zip(self.frame.ends, self.theme.hand_pens)):
+            if atlas is not None and atlas.draw(painter, hand, self.frame.positions[hand], self._origin):
+                continue
+            painter.setTransform(dial_transform)
+            painter.setPen(pen)
+            painter.drawLine(center, QPointF(*end))
+            painter.resetTransform()
+        # デジタル表示は針の上に重ねる（ウィジェット座標・倍率はフォント側で反映済み）
+        self.readout.draw(painter, self.theme.number, event.region())
+        if self.hud_lines and event.region().intersects(self._hud_rect):
+            self.draw_hud(painter)
+        painter.end()
+        paint_ms = (time.perf_counter() - started) * 1000
+        self.paint_ms.append(paint_ms)
+        if self.metrics is not None:
+            self.metrics.record("paint_ms", paint_ms)
+        if self.on_first_paint is not None:
+            callback, self.on_first_paint = self.on_first_paint, None
+            callback()
+
+    # -------- 針の更新（差分領域のみ再描画） --------
+    def local_snapshot(self, snapshot):
+        # ゾーン指定があればオフセット表でそのゾーンの時刻へ変換する
+        return snapshot if self.zone is None else self.zone.snapshot(snapshot)
+
+    def on_tick(self, snapshot):
+        if self.sweep_fps:
+            return  # スムーズモード中はフレームタイマーで動かす
+        self.show_frame(self.engine.frame(self.local_snapshot(snapshot)))
+
+    def move_hands(self, positions):
+        """針位置 ((index, steps) × 3) を直接指定する（ベンチマーク等）"""
+        self.show_frame(self.engine.frame_for(positions))
+
+    def show_frame(self, frame):
+        self.frame = frame
+        if not frame.changed & CHANGED_HANDS:
+            return
+        self._hands_pending = True
+        if frame.previous is None:
+            self.update()
+            return
+        # 動いた針について、旧位置と新位置の外接矩形の和だけを無効化する
+        region = QRegion()
+        for hand, (length, width) in enumerate(HAND_SPECS):
+            if frame.hand_changed(hand):
+                region += self.hand_rect(frame.previous[hand], length, width)
+                region += self.hand_rect(frame.positions[hand], length, width)
+        self.update(region)
+
+    def hand_rect(self, position, length, width):
+        # 針の線分の外接矩形（ウィジェット座標）。ペン幅の半分とAA余白を含める
+        rect = QRectF(QPointF(CENTER), self.hand_end(position, length)).normalized()
+        pad = width / 2 + HAND_DAMAGE_MARGIN
+        rect.adjust(-pad, -pad, pad, pad)
+        origin = QPointF(self._origin)
+        return QRectF(rect.topLeft() * self.factor + origin, rect.bottomRight() * self.factor + origin).toAlignedRect()
+
+    def _count_repainted_pixels(self, region):
+        dpr = self.devicePixelRatioF()
+        self._damage_pixels += sum(r.width() * r.height() for r in region) * dpr * dpr
+        if self._hands_pending:
+            self._hands_pending = False
+            self._damage_frames += 1
+        now = time.monotonic()
+        elapsed = now - self._damage_window_start
+        if elapsed >= 1.0:
+            self.repainted_pixels_per_second = int(self._damage_pixels / elapsed)
+            self.achieved_fps = self._damage_frames / elapsed
+            self._damage_pixels = 0
+            self._damage_frames = 0
+            self._damage_window_start = now
+
+    @staticmethod
+    def hand_end(position, length):
+        # position: (表インデックス, 一周の分割数)。三角関数は使わず座標表を引く
+        index, steps = position
+        return QPointF(*GEOMETRY.hand_end(length, steps, index))
+
+# ---------------------- Qt Quick 版の時計ウィジェット ----------------------
+class QuickClockWidget(QWidget):
+    """Qt Quick（シーングラフ）で描く時計。ClockWidget と同じ操作で MainWindow から使える。
+
+    文字盤は clock_quick.qml の静的ノード（レイヤーで1枚にまとめる）、針は Rotation 付きの
+    矩形で、毎秒は3つの回転角プロパティを書き換えるだけ。GPU の無い環境でも動くよう、
+    QT_QUICK_BACKEND の指定が無ければソフトウェアのシーングラフ・バックエンドを使う。
+    QtQuick は重いため、この描画方式を選んだときにだけ読み込む。
+    スムーズモードは固定 fps（描画コストによる自動調整は ClockWidget のみ）。
+    """
+
+    def __init__(self, parent=None, factor=1.0):
+        super().__init__(parent)
+        from PySide6.QtQuick import QQuickWindow, QSGRendererInterface
+        from PySide6.QtQuickWidgets import QQuickWidget
+        if "QT_QUICK_BACKEND" not in os.environ:
+            QQuickWindow.setGraphicsApi(QSGRendererInterface.Software)
+        self.factor = factor
+        self.preferred_factor = factor
+        self.theme = None
+        self.metrics = None
+        self.on_first_paint = None
+        self.engine = ClockEngine(GEOMETRY, HAND_LENGTHS)  # 角度と変化した針だけを使う
+        # リサイズ中は文字盤のテクスチャを拡縮し、止まってから一度だけ作り直す（dialFactor）
+        self._dial_settle_timer = QTimer(self)
+        self._dial_settle_timer.setSingleShot(True)
+        self._dial_settle_timer.setInterval(RESIZE_SETTLE_MS)
+        self._dial_settle_timer.timeout.connect(self._settle_dial)
+        self.readout_format = DEFAULT_READOUT_FORMAT
+        # 計測（ClockWidget と同じ項目。再描画量はウィジェット全体×フレーム数）
+        self.paint_ms = deque(maxlen=PAINT_COST_HISTORY)
+        self.repainted_pixels_per_second = 0
+        self.achieved_fps = 0.0
+        self._frames = 0
+        self._window_start = time.monotonic()
+        self._render_started = None
+        self.sweep_fps = 0
+        self.sweep_max_fps = 0
+
+        self.view = QQuickWidget(self)
+        self.view.setResizeMode(QQuickWidget.SizeRootObjectToView)
+        self.view.setSource(QUrl.fromLocalFile(str(QUICK_QML_FILE)))
+        if self.view.status() != QQuickWidget.Ready:
+            raise RuntimeError("; ".join(e.toString() for e in self.view.errors()))
+        self.root = self.view.rootObject()
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(self.view)
+
+        # 静的な寸法は一度だけ渡す
+        self.root.setProperty("logicalSize", WINDOW_SIZE)
+        self.root.setProperty("maxFactor", MAX_FACTOR)
+        self.root.setProperty("centerX", CENTER.x())
+        self.root.setProperty("centerY", CENTER.y())
+        self.root.setProperty("radius", CLOCK_RADIUS)
+        self.root.setProperty("tickMajorLength", TICK_LENGTH_MAJOR)
+        self.root.setProperty("tickMinorLength", TICK_LENGTH_MINOR)
+        self.root.setProperty("numberPointSize", FONT_SIZE)
+        self.root.setProperty("numberPositions", [list(GEOMETRY.number(i)) for i in range(1, 13)])
+        self.root.setProperty("handSpecs", [list(spec) for spec in HAND_SPECS])
+        self.root.setProperty("dialFactor", factor)
+
+        window = self.view.quickWindow()
+        window.beforeSynchronizing.connect(self._on_before_render)
+        window.afterRendering.connect(self._on_after_render)
+
+        self._frame_timer = QTimer(self)
+        self._frame_timer.setTimerType(Qt.PreciseTimer)
+        self._frame_timer.timeout.connect(self.on_frame)
+        self._readout_timer = QTimer(self)
+        self._readout_timer.setTimerType(Qt.PreciseTimer)
+        self._readout_timer.timeout.connect(self.on_readout_frame)
+
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+        minimum = int(WINDOW_SIZE * min(factor, MIN_FACTOR))
+        self.setMinimumSize(minimum, minimum)
+        self.set_theme(CompiledTheme(AUTO_LIGHT_THEME, LIGHT_THEME))
+        self.show_frame(self.engine.frame(take_snapshot()))
+
+    def set_theme(self, theme):
+        self.theme = theme
+        self.engine.set_theme(theme)
+        c = theme.spec
+        self.view.setClearColor(theme.bg)
+        for name, key in (("bgColor", "bg"), ("lineColor", "line"), ("numberColor", "number"),
+                          ("tickColor", "tick"), ("secondColor", "second")):
+            self.root.setProperty(name, c[key])
+
+    def resize_by_factor(self, factor):
+        self.preferred_factor = factor
+        self.updateGeometry()
+
+    def sizeHint(self):
+        size = round(WINDOW_SIZE * self.preferred_factor)
+        return QSize(size, size)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        # 倍率そのものは QML 側で短辺から求める（ここでは記録と文字盤の作り直しの予約だけ）
+        factor = dial_side_for(self.width(), self.height()) / WINDOW_SIZE
+        if factor != self.factor:
+            self.factor = factor
+            self._dial_settle_timer.start()
+
+    def _settle_dial(self):
+        if self.factor > 0:
+            self.root.setProperty("dialFactor", self.factor)
+
+    # -------- 針 --------
+    def on_tick(self, snapshot):
+        if self.sweep_fps:
+            return
+        self.show_frame(self.engine.frame(snapshot))
+
+    def move_hands(self, positions):
+        self.show_frame(self.engine.frame_for(positions))
+
+    def show_frame(self, frame):
+        for hand, name in enumerate(("hourAngle", "minuteAngle", "secondAngle")):
+            if frame.hand_changed(hand):
+                self.root.setProperty(name, frame.angle(hand))
+
+    def set_sweep(self, fps):
+        if fps and fps > 0:
+            self.sweep_fps = self.sweep_max_fps = fps
+            self._frame_timer.start(max(1, round(1000 / fps)))
+            self.on_frame()
+        else:
+            self.sweep_fps = self.sweep_max_fps = 0
+            self._frame_timer.stop()
+            self.show_frame(self.engine.frame(take_snapshot()))
+
+    def on_frame(self):
+        self.show_frame(self.engine.frame(take_snapshot(), SWEEP_STEPS))
+
+    def suspend(self):
+        self._frame_timer.stop()
+        self._readout_timer.stop()
+
+    def resume(self):
+        if self.sweep_fps:
+            self._frame_timer.start(max(1, round(1000 / self.sweep_fps)))
+            self.on_frame()
+        if self.readout_format.show_ms:
+            self._readout_timer.start(READOUT_MS_INTERVAL_MS)
+            self.on_readout_frame()
+
+    # -------- デジタル表示/計測オーバーレイ --------
+    def set_readout_format(self, fmt):
+        self.readout_format = fmt
+        if fmt.show_ms:
+            self._readout_timer.start(READOUT_MS_INTERVAL_MS)
+        else:
+            self._readout_timer.stop()
+        self.show_time(take_snapshot())
+
+    def set_readout_font(self, font, origin):
+        self.root.setProperty("readoutFont", font)
+        self.root.setProperty("readoutX", origin.x())
+        self.root.setProperty("readoutY", origin.y())
 
-        now = time.localtime()
-        second = now.tm_sec
-        minute = now.tm_min
-        hour = now.tm_hour % 12 + minute / 60.0
-
-        self.draw_hand(painter, hour * 30, LENGTH_HOUR_HAND, 8)
-        self.draw_hand(painter, minute * 6, LENGTH_MINUTE_HAND, 5)
-        self.draw_hand(painter, second * 6, LENGTH_SECOND_HAND, 2, color=self.theme["second"])
-
-    def draw_hand(self, painter, angle_deg, length, width, color=None):
-        angle = math.radians(angle_deg)
-        end = QPoint(
-            CENTER.x() + length * math.sin(angle),
-            CENTER.y() - length * math.cos(angle)
-        )
-        pen = painter.pen()
-        pen.setWidth(width)
-        pen.setColor(QColor(color if color else self.theme["line"]))
-        painter.setPen(pen)
-        painter.drawLine(CENTER, end)
+    def show_time(self, snapshot):
+        self.root.setProperty("readoutText", format_readout(snapshot.epoch, self.readout_format, snapshot.local))
+
+    def on_readout_frame(self):
+        self.show_time(take_snapshot())
+
+    def set_hud(self, lines):
+        self.root.setProperty("hudText", "\n".join(lines) if lines else "")
+
+    # -------- 計測 --------
+    def _on_before_render(self):
+        self._render_started = time.perf_counter()
+
+    def _on_after_render(self):
+        if self._render_started is None:
+            return
+        render_ms = (time.perf_counter() - self._render_started) * 1000
+        self._render_started = None
+        self.paint_ms.append(render_ms)
+        if self.metrics is not None:
+            self.metrics.record("paint_ms", render_ms)
+        self._frames += 1
+        now = time.monotonic()
+        elapsed = now - self._window_start
+        if elapsed >= 1.0:
+            dpr = self.devicePixelRatioF()
+            self.achieved_fps = self._frames / elapsed
+            self.repainted_pixels_per_second = int(self.width() * self.height() * dpr * dpr * self._frames / elapsed)
+            self._frames = 0
+            self._window_start = now
+        if self.on_first_paint is not None:
+            callback, self.on_first_paint = self.on_first_paint, None
+            callback()
+
+    def paint_cost_ms(self):
+        return sum(self.paint_ms) / len(self.paint_ms) if self.paint_ms else 0.0
 
 # ---------------------- メインウィンドウ ----------------------
 class MainWindow(QMainWindow):
-    def __init__(self):
+    def __init__(self, sweep_fps=0, profile=None, readout_format=DEFAULT_READOUT_FORMAT, settings=None,
+                 metrics=None, metrics_file=METRICS_FILE, renderer=RENDERER_PAINTER, hand_atlas_mb=0, positions=None):
         super().__init__()
-        self.is_dark_theme = False
-        self.is_auto_theme = True
+        self.renderer = renderer
+        self.profile = profile
+        self.metrics = None  # 計測は任意（--metrics または F3 で有効化）
+        self.metrics_file = Path(metrics_file)
+        self.is_hud_visible = False
+        # 設定は起動時に一度だけ読み、変更はメモリ上で更新して遅延保存する（UI ハンドラでディスク I/O しない）
+        if settings is None:
+            settings = open_settings(SETTINGS_NAME, SETTINGS_DEFAULTS, legacy=read_legacy_settings(position_file=None))
+        self.settings = settings
+        # ウィンドウ位置はホストごとのファイル（共有フォルダで多数の端末から起動しても衝突しない）
+        if positions is None:
+            positions = open_positions(SETTINGS_NAME, legacy=settings.get_host("position"))
+        self.positions = positions
+        self.tick_audio = None  # 秒針音を初めて有効にしたときに作る
+        # テーマは起動時に一度だけコンパイルし、切替は名前の差し替えのみで行う
+        self.themes = load_themes()
+        self.theme_name = settings.get("theme")
+        if self.theme_name not in self.themes:
+            self.theme_name = AUTO_LIGHT_THEME
+        self.is_auto_theme = bool(settings.get("auto_theme"))
+        self.applied_theme = None
         self.factor = self.load_factor()
-        self.last_second = None
+        self.saved_factor = round(self.factor, 3)  # 設定に記録済みの倍率（変わったときだけ保存/ログ）
+        self.ui_scale = self.quantize_ui_scale(self.factor)
         self.is_tick_sound = False
+        self.is_suspended = False
 
-        self.clock = ClockWidget(self, self.factor)
-        # デジタル表示は時計上にオーバーレイ配置（2行目左端相当）
-        self.digital_label = QLabel(self.clock)
-        self.digital_label.setAlignment(Qt.AlignLeft | Qt.AlignVCenter)
+        if renderer == RENDERER_QUICK:
+            self.clock = QuickClockWidget(self, self.factor)
+            if hand_atlas_mb:
+                print("[warn] --hand-atlas は --renderer painter のときだけ使えます")
+        else:
+            self.clock = ClockWidget(self, self.factor)
+            self.clock.set_hand_atlas(hand_atlas_mb)
+        if profile is not None:
+            self.clock.on_first_paint = lambda: profile.mark("first paint")
+        # デジタル表示は時計ウィジェット自身が左上に描く（QLabel の再レイアウトを避ける）
+        self.clock.readout_format = readout_format
+        # 時計の大きさはウィンドウに従う。リサイズ中は針とオーバーレイだけを追従させ、
+        # 止まってから UI の拡縮・倍率の保存を一度だけ行う
+        self.clock.installEventFilter(self)
+        self.resize_settle_timer = QTimer(self)
+        self.resize_settle_timer.setSingleShot(True)
+        self.resize_settle_timer.setInterval(RESIZE_SETTLE_MS)
+        self.resize_settle_timer.timeout.connect(self.on_resize_settled)
 
         self.size_button = QPushButton("サイズ変更")
         self.size_button.clicked.connect(self.toggle_size)
@@ -153,7 +1235,7 @@ class MainWindow(QMainWindow):
         self.color_button.clicked.connect(self.toggle_theme)
 
         self.auto_checkbox = QCheckBox("Auto")
-        self.auto_checkbox.setChecked(True)
+        self.auto_checkbox.setChecked(self.is_auto_theme)
         self.auto_checkbox.stateChanged.connect(self.on_auto_changed)
 
         # 秒針音スイッチと音量
@@ -163,14 +1245,15 @@ class MainWindow(QMainWindow):
 
         self.volume_slider = QSlider(Qt.Horizontal)
         self.volume_slider.setRange(0, 100)
-        self.volume_slider.setValue(50)
+        self.volume_slider.setValue(max(0, min(100, int(settings.get("volume", 50)))))
         self.volume_slider.setTickInterval(10)
         self.volume_slider.setTickPosition(QSlider.NoTicks)
         self.volume_slider.valueChanged.connect(self.on_volume_changed)
-        self.volume_label = QLabel("50%")
+        self.volume_label = QLabel(f"{self.volume_slider.value()}%")
 
         self.always_on_top_checkbox = QCheckBox("常に手前", self.clock)
-        self.always_on_top_checkbox.setChecked(False)
+        self.always_on_top_checkbox.setChecked(bool(settings.get("always_on_top")))
+        self.setWindowFlag(Qt.WindowStaysOnTopHint, self.always_on_top_checkbox.isChecked())
         self.always_on_top_checkbox.stateChanged.connect(self.on_always_on_top_changed)
 
         header = QHBoxLayout()
@@ -193,86 +1276,231 @@ class MainWindow(QMainWindow):
         self.container = QWidget()
         self.container.setObjectName("central")
         self.container.setLayout(layout)
+        self.container.setStyleSheet(build_stylesheet(self.themes))
         self.setCentralWidget(self.container)
 
         self.setWindowTitle("アナログ時計")
         self.apply_ui_scale()
         self.resize_to_content()
 
-        self.update_timer = QTimer(self)
-        self.update_timer.timeout.connect(self.update_datetime_label)
-        self.update_timer.start(UPDATE_INTERVAL)
-        self.update_datetime_label()
-
-        self.auto_timer = QTimer(self)
-        self.auto_timer.timeout.connect(self.apply_auto_theme)
-        self.auto_timer.start(AUTO_CHECK_INTERVAL_MS)
-        self.apply_auto_theme()
+        # 時刻駆動の処理はすべて1つのティック配信に購読させる
+        self.tick_bus = TickBus(self)
+        self.tick_bus.subscribe(self.clock.on_tick)
+        self.tick_bus.subscribe(self.update_datetime_label)
+        self.tick_bus.time_jumped.connect(self.on_time_jumped)
+        self.tick_bus.start()
+        self.clock.set_sweep(sweep_fps)
+        if profile is not None:
+            self.tick_bus.subscribe(self._on_first_tick)
+        self.clock.set_readout_format(readout_format)
+        # 自動テーマは次の切替時刻に単発タイマーを張る（毎分のポーリングはしない）
+        self.theme_timer = QTimer(self)
+        self.theme_timer.setSingleShot(True)
+        self.theme_timer.setTimerType(Qt.PreciseTimer)
+        self.theme_timer.timeout.connect(self.on_theme_transition)
+        self.apply_auto_theme(self.tick_bus.snapshot)
+        self.apply_theme()
+        self.schedule_theme_transition()
 
-        # 秒針音の初期化
-        self.tick_effect = QSoundEffect(self)
-        try:
-            tick_path = self.ensure_tick_wav()
-            self.tick_effect.setSource(QUrl.fromLocalFile(str(tick_path)))
-        except Exception as e:
-            print(f"[warn] tick sound init failed: {e}")
-        self.tick_effect.setLoopCount(1)
-        self.tick_effect.setVolume(self._scaled_volume(self.volume_slider.value()))
-        # 初期の音量ラベル反映
+        # 初期の音量ラベル反映（秒針音そのものは有効化されるまで初期化しない）
         self.on_volume_changed(self.volume_slider.value())
+        self.sound_checkbox.setChecked(bool(settings.get("tick_sound")))
+        self.restore_position()
+
+        # 計測のホットキー（F3: オーバーレイ、F4: JSON 出力、F6: cProfile 取得）
+        QShortcut(QKeySequence(Qt.Key_F3), self, self.toggle_hud)
+        QShortcut(QKeySequence(Qt.Key_F4), self, self.dump_metrics)
+        QShortcut(QKeySequence(Qt.Key_F6), self, self.start_profile_window)
+        if metrics is not None:
+            self.attach_metrics(metrics)
+        if profile is not None:
+            profile.mark("window")
+
+    def _on_first_tick(self, snapshot):
+        self.tick_bus.unsubscribe(self._on_first_tick)
+        self.profile.mark("first tick")
+        self.profile.report()
 
     # -------- サイズ関連 --------
     def load_factor(self):
         try:
-            return float(FACTOR_FILE.read_text())
-        except Exception:
+            factor = float(self.settings.get("factor"))
+        except (TypeError, ValueError):
             return 1.0
+        return factor if MIN_FACTOR <= factor <= MAX_FACTOR else 1.0
 
     def save_factor(self):
-        FACTOR_FILE.write_text(str(self.factor))
+        self.saved_factor = round(self.factor, 3)
+        self.settings.set("factor", self.saved_factor)
+
+    @staticmethod
+    def quantize_ui_scale(factor, current=None):
+        """UI（ボタン等）の拡縮率。UI_SCALE_STEP 刻みで、境界付近では現在の値を保つ"""
+        if current is not None and abs(factor - current) <= UI_SCALE_STEP / 2 + UI_SCALE_HYSTERESIS:
+            return current
+        return max(MIN_FACTOR, round(factor / UI_SCALE_STEP) * UI_SCALE_STEP)
+
+    def zoom_to(self, factor):
+        """時計の短辺が WINDOW_SIZE * factor になるようにウィンドウを一度だけリサイズする"""
+        factor = max(MIN_FACTOR, min(MAX_FACTOR, factor))
+        self.clock.resize_by_factor(factor)
+        # 先に UI の拡縮を済ませ、ヘッダの高さが確定した状態で差分を求める（二度目のリサイズを避ける）
+        ui_scale = self.quantize_ui_scale(factor, self.ui_scale)
+        if ui_scale != self.ui_scale:
+            self.ui_scale = ui_scale
+            self.apply_ui_scale()
+            self.centralWidget().layout().activate()
+        delta = round(WINDOW_SIZE * factor) - min(self.clock.width(), self.clock.height())
+        if delta:
+            self.resize(self.width() + delta, self.height() + delta)
+
+    def on_clock_resized(self, size):
+        # イベントフィルタは時計の resizeEvent より先に呼ばれるため、新しい大きさから求める
+        self.factor = dial_side_for(size.width(), size.height()) / WINDOW_SIZE
+        self.place_overlay()
+        self.resize_settle_timer.start()
+
+    def on_resize_settled(self):
+        ui_scale = self.quantize_ui_scale(self.factor, self.ui_scale)
+        if ui_scale != self.ui_scale:
+            self.ui_scale = ui_scale
+            self.apply_ui_scale()
+        # 起動直後の最初の確定（ユーザーは何も変えていない）は保存もログもしない
+        if self.isVisible() and round(self.factor, 3) != self.saved_factor:
+            self.save_factor()
+            self.log_state("[サイズ変更]")
+
+    def wheelEvent(self, event):
+        # Ctrl+ホイールで拡大/縮小（高分解能ホイールは目盛りの端数も反映）
+        if event.modifiers() & Qt.ControlModifier:
+            notches = event.angleDelta().y() / 120
+            if notches:
+                self.zoom_to(self.factor * ZOOM_STEP ** notches)
+            event.accept()
+            return
+        super().wheelEvent(event)
+
+    # -------- ウィンドウ位置（ホストごと） --------
+    def restore_position(self):
+        position = self.positions.get()
+        try:
+            x, y = (int(v) for v in position)
+        except (TypeError, ValueError):
+            return
+        # 接続されていない画面の座標なら復元しない（OS に任せる）
+        if QGuiApplication.screenAt(QPoint(x, y)) is not None:
+            self.move(x, y)
+
+    def moveEvent(self, event):
+        super().moveEvent(event)
+        if self.isVisible():
+            # ドラッグ中の連続した移動は位置ストア側でまとめて1回の書き込みになる
+            self.positions.set([self.x(), self.y()])
+
+    def closeEvent(self, event):
+        self.positions.set([self.x(), self.y()])
+        self.positions.flush()
+        self.settings.flush()
+        if self.metrics is not None:
+            self.dump_metrics()
+        super().closeEvent(event)
+
+    # -------- 計測 --------
+    def attach_metrics(self, metrics):
+        """記録箇所（描画/ティック/秒針音/再スタイル）に計測オブジェクトを渡す"""
+        self.metrics = metrics
+        self.clock.metrics = metrics
+        self.tick_bus.set_metrics(metrics)
+        if self.tick_audio is not None:
+            self.tick_audio.metrics = metrics
+
+    def toggle_hud(self):
+        if self.metrics is None:
+            self.attach_metrics(Metrics())
+        self.is_hud_visible = not self.is_hud_visible
+        if self.is_hud_visible:
+            self.tick_bus.subscribe(self.refresh_hud)
+            self.refresh_hud(self.tick_bus.snapshot)
+        else:
+            self.tick_bus.unsubscribe(self.refresh_hud)
+            self.clock.set_hud(None)
+
+    def refresh_hud(self, snapshot):
+        m = self.metrics
+        paint = m.summary("paint_ms")
+        late = m.summary("tick_late_ms")
+        c = m.counters
+        lines = [
+            f"paint  p50 {paint.get('p50', 0):6.2f}  p99 {paint.get('p99', 0):6.2f}  max {paint.get('max', 0):6.2f} ms",
+            f"tick   p50 {late.get('p50', 0):6.2f}  p99 {late.get('p99', 0):6.2f}  max {late.get('max', 0):6.2f} ms",
+            f"skip {c.get('skipped_seconds', 0)}  dup {c.get('duplicated_seconds', 0)}"
+            f"  jump {c.get('time_jumps', 0)}  restyle {c.get('restyles', 0)}",
+            f"fps {self.clock.achieved_fps:4.1f}  damage {self.clock.repainted_pixels_per_second}px/s",
+        ]
+        audio = m.summary("audio_error_ms")
+        if audio["count"]:
+            lines.append(f"audio  p50 {audio['p50']:6.2f}  p99 {audio['p99']:6.2f}  max {audio['max']:6.2f} ms")
+        if m.is_profiling():
+            lines.append("cProfile 取得中...")
+        self.clock.set_hud(lines)
+
+    def dump_metrics(self):
+        if self.metrics is None:
+            self.attach_metrics(Metrics())
+        meta = {"factor": self.factor, "theme": self.theme_name, "sweep_fps": self.clock.sweep_fps}
+        try:
+            self.metrics.dump(self.metrics_file, meta)
+            print(f"[計測] 保存: {self.metrics_file}")
+        except OSError as e:
+            print(f"[warn] metrics not saved: {e}")
+
+    def start_profile_window(self):
+        if self.metrics is None:
+            self.attach_metrics(Metrics())
+        if self.metrics.start_profile():
+            print(f"[計測] cProfile を {METRICS_PROFILE_SECONDS} 秒間取得します")
+            QTimer.singleShot(METRICS_PROFILE_SECONDS * 1000, self.finish_profile_window)
+
+    def finish_profile_window(self):
+        print(self.metrics.stop_profile(METRICS_PROFILE_FILE))
+        print(f"[計測] 保存: {METRICS_PROFILE_FILE}")
 
     def toggle_size(self):
-        factors = [1.0, 1.5, 2.0, 2.5]
-        # 近似一致でインデックスを求める（浮動小数の誤差対策）
-        def nearest_index(val):
-            diffs = [abs(val - f) for f in factors]
-            return diffs.index(min(diffs))
-        idx = (nearest_index(self.factor) + 1) % len(factors)
-        self.factor = factors[idx]
-        self.save_factor()
-        self.clock.resize_by_factor(self.factor)
-        self.apply_ui_scale()
-        self.resize_to_content()
-        # OSの最小サイズ制約で縮まらないことがあるため二度実行
-        self.resize_to_content()
-        self.log_state("[サイズ変更]")
+        # 現在の倍率より大きい次のプリセットへ（最大を超えたら最小へ戻る）。自由サイズからでも使える
+        larger = [f for f in SIZE_PRESETS if f > self.factor + 0.01]
+        self.zoom_to(larger[0] if larger else SIZE_PRESETS[0])
 
     # -------- テーマ関連 --------
     def toggle_theme(self):
-        self.is_dark_theme = not self.is_dark_theme
+        # 読み込んだ全テーマを順に巡回する
+        names = list(self.themes)
+        index = names.index(self.theme_name) if self.theme_name in names else -1
+        self.theme_name = names[(index + 1) % len(names)]
+        self.settings.set("theme", self.theme_name)
         self.apply_theme()
         self.log_state("[カラー変更]")
 
     def apply_theme(self):
-        theme = DARK_THEME if self.is_dark_theme else LIGHT_THEME
+        theme = self.themes[self.theme_name]
+        if theme is self.applied_theme:
+            return  # 変化がなければ再スタイルしない
+        self.applied_theme = theme
+        if self.metrics is not None:
+            self.metrics.count("restyles")
         self.clock.set_theme(theme)
-        # スタイルシートで中央ウィジェット配下にテーマを適用
-        style = (
-            f"QWidget#central {{ background-color: {theme['bg']}; color: {theme['number']}; }}"
-            f" QLabel {{ color: {theme['number']}; }}"
-            f" QCheckBox {{ color: {theme['number']}; }}"
-            f" QPushButton {{ color: {theme['number']}; border: 1px solid {theme['tick']}; background-color: transparent; }}"
-            f" QSlider::groove:horizontal {{ background: {theme['tick']}; height: 4px; border-radius: 2px; }}"
-            f" QSlider::handle:horizontal {{ background: {theme['number']}; border: 1px solid {theme['tick']}; width: 12px; margin: -6px 0; border-radius: 6px; }}"
-        )
-        self.container.setStyleSheet(style)
+        # スタイルシートは全テーマ分を設定済み。プロパティを切り替えて再ポリッシュするだけ
+        self.container.setProperty("theme", theme.name)
+        style = self.container.style()
+        for widget in [self.container] + self.container.findChildren(QWidget):
+            style.unpolish(widget)
+            style.polish(widget)
+        self.container.update()
 
     def apply_ui_scale(self):
-        # UIのフォントとボタン幅をスケール
-        ui_font_size = max(10, int(12 * self.factor))
+        # UIのフォントとボタン幅をスケール（ui_scale は倍率を刻みに丸めた値）
+        ui_font_size = max(10, int(12 * self.ui_scale))
         ui_font = QFont()
         ui_font.setPixelSize(ui_font_size)
-        self.digital_label.setFont(ui_font)
         self.size_button.setFont(ui_font)
         self.color_button.setFont(ui_font)
         self.auto_checkbox.setFont(ui_font)
@@ -283,10 +1511,9 @@ class MainWindow(QMainWindow):
         self.always_on_top_checkbox.adjustSize()
 
         # デジタル時計の位置を時計ウィジェット左上へ（より左に寄せる）
-        margin_x = max(2, int(4 * self.factor))
-        margin_y = max(2, int(6 * self.factor))
-        self.digital_label.move(margin_x, margin_y)
-        self.digital_label.raise_()
+        margin_x = max(2, int(4 * self.ui_scale))
+        margin_y = max(2, int(6 * self.ui_scale))
+        self.clock.set_readout_font(ui_font, QPoint(margin_x, margin_y))
 
         # ボタンの横幅を「サイズヒントの半分」かつ「文字列幅+余白」を下回らないように設定
         fm = QFontMetrics(ui_font)
@@ -298,20 +1525,23 @@ class MainWindow(QMainWindow):
         self.color_button.setFixedWidth(half_or_text(self.color_button))
         # スライダー幅をスケール
         base_slider_w = 50
-        self.volume_slider.setFixedWidth(max(100, int(base_slider_w * self.factor)))
+        self.volume_slider.setFixedWidth(max(100, int(base_slider_w * self.ui_scale)))
+        self.place_overlay()
 
+    def place_overlay(self):
         # 「常に手前」チェックボックスを時計ウィジェット右上に配置
-        chk_w = self.always_on_top_checkbox.width()
-        chk_h = self.always_on_top_checkbox.height()
-        x = max(0, self.clock.width() - margin_x - chk_w)
-        y = margin_y
-        self.always_on_top_checkbox.move(x, y)
+        margin_x = max(2, int(4 * self.ui_scale))
+        margin_y = max(2, int(6 * self.ui_scale))
+        x = max(0, self.clock.width() - margin_x - self.always_on_top_checkbox.width())
+        self.always_on_top_checkbox.move(x, margin_y)
         self.always_on_top_checkbox.raise_()
 
     def log_state(self, source: str):
-        theme_name = "DARK" if self.is_dark_theme else "LIGHT"
+        theme_name = self.theme_name.upper()
         auto = "ON" if self.is_auto_theme else "OFF"
-        print(f"{source} factor={self.factor:.2f}, clock={self.clock.width()}x{self.clock.height()}, window={self.width()}x{self.height()}, theme={theme_name}, auto={auto}")
+        print(f"{source} renderer={self.renderer}, factor={self.factor:.2f}, clock={self.clock.width()}x{self.clock.height()}, window={self.width()}x{self.height()}, theme={theme_name}, auto={auto}, damage={self.clock.repainted_pixels_per_second}px/s, tick_late_max={self.tick_bus.timer.max_lateness_ms():.1f}ms, fps={self.clock.achieved_fps:.1f}/{self.clock.sweep_fps}, paint={self.clock.paint_cost_ms():.2f}ms"
+              + (f", hands={self.clock.hand_mode()}" if self.renderer == RENDERER_PAINTER else "")
+              + (f", audio_err_max={self.tick_audio.max_error_ms():.1f}ms" if self.tick_audio is not None else ""))
 
     def resize_to_content(self):
         # 幾何情報を更新し、推奨サイズに合わせて縮小も許可
@@ -325,49 +1555,117 @@ class MainWindow(QMainWindow):
 
     def on_auto_changed(self, state):
         self.is_auto_theme = bool(state)
+        self.settings.set("auto_theme", self.is_auto_theme)
         if self.is_auto_theme:
             self.apply_auto_theme()
+        self.schedule_theme_transition()
 
-    def apply_auto_theme(self):
+    def apply_auto_theme(self, snapshot=None):
         if not self.is_auto_theme:
             return
-        hour = time.localtime().tm_hour
-        self.is_dark_theme = (hour < 6 or hour >= 18)
+        if snapshot is None:
+            snapshot = take_snapshot()
+        self.theme_name = AUTO_DARK_THEME if is_dark_time(snapshot.local) else AUTO_LIGHT_THEME
         self.apply_theme()
 
+    def schedule_theme_transition(self):
+        self.theme_timer.stop()
+        if self.is_auto_theme:
+            # 切替時刻ちょうどに起きるよう 1ms 余分に待つ（早すぎると切替前の時刻と判定されるため）
+            self.theme_timer.start(math.ceil(seconds_until_transition() * 1000) + 1)
+
+    def on_theme_transition(self):
+        self.apply_auto_theme()
+        self.schedule_theme_transition()
+
+    def on_time_jumped(self):
+        # スリープ復帰や時計変更で予定時刻がずれた可能性があるため、判定と予定をやり直す
+        self.apply_auto_theme()
+        self.schedule_theme_transition()
+
+    # -------- 非表示中の停止 --------
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self.windowHandle() is not None:
+            # 他ウィンドウに完全に隠れた場合（対応プラットフォームのみ）は Expose で通知される
+            self.windowHandle().removeEventFilter(self)
+            self.windowHandle().installEventFilter(self)
+        self.update_suspension()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.update_suspension()
+
+    def changeEvent(self, event):
+        super().changeEvent(event)
+        if event.type() == QEvent.WindowStateChange:
+            self.update_suspension()
+
+    def eventFilter(self, obj, event):
+        if obj is self.windowHandle() and event.type() == QEvent.Expose:
+            self.update_suspension()
+        elif obj is self.clock and event.type() == QEvent.Resize:
+            self.on_clock_resized(event.size())
+        return super().eventFilter(obj, event)
+
+    def update_suspension(self):
+        window = self.windowHandle()
+        exposed = window is None or window.isExposed()
+        hidden = not self.isVisible() or self.isMinimized() or not exposed
+        if hidden and not self.is_suspended:
+            # 時計/デジタル表示/自動テーマはすべてティック配信経由なので、配信を止めれば描画は全停止。
+            # 秒針音は専用のタイマーで鳴るため止めない（隠れていてもメトロノーム代わりに聞こえるように）
+            self.is_suspended = True
+            self.tick_bus.stop()
+            self.clock.suspend()
+        elif not hidden and self.is_suspended:
+            self.is_suspended = False
+            self.tick_bus.resume()
+            self.clock.resume()
+
     # -------- 前面表示 --------
     def on_always_on_top_changed(self, state):
         is_top = bool(state)
+        self.settings.set("always_on_top", is_top)
         self.setWindowFlag(Qt.WindowStaysOnTopHint, is_top)
         # フラグ変更を即時反映
         self.show()
 
     # -------- デジタル表示 --------
-    def update_datetime_label(self):
-        self.digital_label.setText(time.strftime("%Y-%m-%d %H:%M:%S"))
-        self.digital_label.adjustSize()
-        # 秒針音の再生（毎秒）
-        now = time.localtime()
-        current_second = now.tm_sec
-        if self.sound_checkbox.isChecked():
-            if self.last_second != current_second:
-                if hasattr(self, "tick_effect") and self.tick_effect is not None:
-                    if self.tick_effect.isPlaying():
-                        self.tick_effect.stop()
-                    self.tick_effect.play()
-        self.last_second = current_second
+    def update_datetime_label(self, snapshot):
+        if not self.clock.readout_format.show_ms:
+            self.clock.show_time(snapshot)
+
 
     # -------- 秒針音関連 --------
     def on_sound_changed(self, state):
+        # 秒針音は秒境界に合わせて専用タイマーで鳴らす（ティック配信の発火は境界ちょうどで、出力遅延を補償できないため）
         self.is_tick_sound = bool(state)
+        self.settings.set("tick_sound", self.is_tick_sound)
+        if not self.is_tick_sound:
+            if self.tick_audio is not None:
+                self.tick_audio.stop()
+            return
+        self.ensure_tick_audio()
+        if self.tick_audio is not None:
+            # 無音から有効化時の即時反映（音量も適用）
+            self.tick_audio.set_volume(self._scaled_volume(self.volume_slider.value()))
+            self.tick_audio.start()
 
-        # 無音から有効化時の即時反映（音量も適用）
-        if hasattr(self, "tick_effect") and self.tick_effect is not None:
-            self.tick_effect.setVolume(self._scaled_volume(self.volume_slider.value()))
+    def ensure_tick_audio(self):
+        # 初回のみ QtMultimedia を読み込み、出力ストリームを用意する
+        if self.tick_audio is not None:
+            return
+        try:
+            self.tick_audio = TickAudioEngine(self, TICK_SOUND)
+            self.tick_audio.metrics = self.metrics
+        except Exception as e:
+            print(f"[warn] tick sound init failed: {e}")
 
     def on_volume_changed(self, value: int):
-        if hasattr(self, "tick_effect") and self.tick_effect is not None:
-            self.tick_effect.setVolume(self._scaled_volume(value))
+        self.settings.set("volume", value)
+        if self.tick_audio is not None:
+            self.tick_audio.set_volume(self._scaled_volume(value))
         if hasattr(self, "volume_label"):
             self.volume_label.setText(f"{value}%")
 
@@ -380,53 +1678,127 @@ class MainWindow(QMainWindow):
         scaled = max(0.0, min(1.0, normalized * VOLUME_MAX_SCALE))
         return scaled
 
-    def ensure_tick_wav(self) -> Path:
-        path = Path(__file__).parent / "tick.wav"
-        if not path.exists():
-            self.generate_tick_wav(path)
-        return path
-
-    def generate_tick_wav(self, path: Path):
-        # 機械式のクリックに近い短いインパルス＋減衰ノイズを合成
-        import wave
-        import struct
-        import random
-        sample_rate = 44100
-        duration_sec = 0.06
-        num_samples = int(sample_rate * duration_sec)
-        attack_samples = int(0.002 * sample_rate)   # 2ms 立ち上がり
-        decay_samples = num_samples - attack_samples
-        click_amp = 12000
-        noise_amp = 7000
-        # ハイパス気味のノイズ成分を入れてメカ感を演出
-        prev = 0.0
-        samples = []
-        for i in range(num_samples):
-            if i < attack_samples:
-                env = i / max(1, attack_samples)
-            else:
-                env = max(0.0, 1.0 - (i - attack_samples) / max(1, decay_samples))
-                env = env * env  # 急速減衰
-            # 小さなインパルス（矩形に近い）
-            impulse = click_amp * (1.0 if i < int(0.0015 * sample_rate) else 0.0)
-            # ハイパス風ノイズ（差分）
-            white = (random.random() * 2.0 - 1.0)
-            hp = white - prev
-            prev = white
-            val = impulse + noise_amp * hp * env
-            val = max(-32767, min(32767, int(val)))
-            samples.append(val)
-        with wave.open(str(path), 'w') as wf:
-            wf.setnchannels(1)
-            wf.setsampwidth(2)
-            wf.setframerate(sample_rate)
-            for v in samples:
-                wf.writeframes(struct.pack('<h', v))
+# ---------------------- 世界時計 ----------------------
+class WorldClockWall(QWidget):
+    """複数タイムゾーンの時計を格子状に並べる表示。
+    ティック配信は1つだけで全時計を順に更新し、文字盤は DIAL_CACHE で全時計が共有する。
+    各時計の時刻はゾーンごとのオフセット切替表から求める（clock_zones）。
+    """
+    def __init__(self, zones, factor=WALL_FACTOR, columns=0, theme_name=AUTO_DARK_THEME,
+                 readout_format=DEFAULT_READOUT_FORMAT):
+        super().__init__()
+        self.themes = load_themes()
+        theme = self.themes.get(theme_name) or self.themes[AUTO_DARK_THEME]
+        self.is_suspended = False
+        # 全時計を1つのタイマーで更新するため、ミリ秒表示と日付は出さない
+        readout_format = readout_format._replace(show_date=False, show_ms=False)
+        columns = columns or max(1, math.ceil(math.sqrt(len(zones))))
+
+        font = QFont()
+        font.setPixelSize(max(9, int(12 * factor)))
+        margin = max(2, int(4 * factor))
+        layout = QGridLayout(self)
+        layout.setSpacing(4)
+        layout.setContentsMargins(6, 6, 6, 6)
+        self.clocks = []
+        for i, zone in enumerate(zones):
+            clock = ClockWidget(self, factor, zone=zone)
+            clock.set_theme(theme)
+            clock.set_readout_font(font, QPoint(margin, margin))
+            clock.set_readout_format(readout_format)
+            caption = QLabel(zone.label)
+            caption.setFont(font)
+            caption.setAlignment(Qt.AlignHCenter)
+            layout.addWidget(clock, (i // columns) * 2, i % columns)
+            layout.addWidget(caption, (i // columns) * 2 + 1, i % columns)
+            self.clocks.append(clock)
+
+        # 見出しの配色はメインウィンドウと同じスタイルシートで切り替える
+        self.setObjectName("central")
+        self.setStyleSheet(build_stylesheet(self.themes))
+        self.setProperty("theme", theme.name)
+        self.setWindowTitle(f"世界時計（{len(zones)}）")
+
+        self.tick_bus = TickBus(self)
+        self.tick_bus.subscribe(self.on_tick)
+        self.tick_bus.start()
+
+    def on_tick(self, snapshot):
+        for clock in self.clocks:
+            clock.on_tick(snapshot)
+            clock.show_time(snapshot)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.update_suspension()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.update_suspension()
+
+    def changeEvent(self, event):
+        super().changeEvent(event)
+        if event.type() == QEvent.WindowStateChange:
+            self.update_suspension()
+
+    def update_suspension(self):
+        hidden = not self.isVisible() or self.isMinimized()
+        if hidden and not self.is_suspended:
+            self.is_suspended = True
+            self.tick_bus.stop()
+        elif not hidden and self.is_suspended:
+            self.is_suspended = False
+            self.tick_bus.resume()
 
 # ---------------------- エントリポイント ----------------------
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="PySide6 アナログ時計")
+    parser.add_argument("--sweep", type=int, default=0, metavar="FPS",
+                        help="秒針を連続的に動かすスムーズモード（例: 10/30/60。0 で1秒ステップ）")
+    parser.add_argument("--clock-format", type=int, choices=(12, 24), default=24,
+                        help="デジタル表示の時刻を 12 時間制（AM/PM）/24 時間制で表示")
+    parser.add_argument("--no-date", action="store_true", help="デジタル表示に日付を出さない")
+    parser.add_argument("--ms", action="store_true", help="デジタル表示にミリ秒を出す")
+    parser.add_argument("--world", nargs="+", default=[], metavar="ZONE[=名前]",
+                        help="世界時計モード: IANA タイムゾーン名を並べる（例: Asia/Tokyo=東京 Europe/London）")
+    parser.add_argument("--world-file", metavar="FILE", help="世界時計のゾーン一覧（1行に1ゾーン、--world と同じ書式）")
+    parser.add_argument("--world-columns", type=int, default=0, metavar="N", help="世界時計の列数（0 で自動）")
+    parser.add_argument("--world-factor", type=float, default=WALL_FACTOR, metavar="F", help="世界時計の各時計の倍率")
+    parser.add_argument("--world-theme", default=AUTO_DARK_THEME, metavar="NAME", help="世界時計のテーマ名")
+    parser.add_argument("--renderer", choices=(RENDERER_PAINTER, RENDERER_QUICK), default=RENDERER_PAINTER,
+                        help="時計の描画方式: painter（QPainter）/ quick（Qt Quick シーングラフ・ソフトウェア描画）")
+    parser.add_argument("--hand-atlas", type=int, nargs="?", const=HAND_ATLAS_LIMIT_MB, default=0, metavar="MB",
+                        help=f"針を角度ごとに描いておいたアトラスから転送する（線を描かない。上限 MB、既定 {HAND_ATLAS_LIMIT_MB}）")
+    parser.add_argument("--metrics", action="store_true",
+                        help="計測を有効にする（F3: オーバーレイ、F4: JSON 出力、F6: cProfile。終了時にも出力）")
+    parser.add_argument("--metrics-file", default=str(METRICS_FILE), metavar="JSON", help="計測結果の出力先")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="import/ウィンドウ構築/初回描画/初回ティックまでの時間を表示")
+    # Qt 自身のオプション（-style など）は QApplication に渡す
+    return parser.parse_known_args(argv[1:])
+
 def main():
-    app = QApplication(sys.argv)
-    w = MainWindow()
+    args, qt_args = parse_args(sys.argv)
+    profile = StartupProfile() if args.profile_startup else None
+    app = QApplication(sys.argv[:1] + qt_args)
+    if profile is not None:
+        profile.mark("QApplication")
+    readout_format = ReadoutFormat(hour24=(args.clock_format == 24), show_date=not args.no_date, show_ms=args.ms)
+    if args.world or args.world_file:
+        try:
+            zones = [parse_zone(spec) for spec in args.world]
+            if args.world_file:
+                zones += load_zone_file(args.world_file)
+        except (OSError, ValueError) as e:
+            # ZoneInfoNotFoundError は KeyError。Windows では pip install tzdata が必要
+            sys.exit(f"世界時計のゾーンを読み込めません: {e}")
+        except KeyError as e:
+            sys.exit(f"不明なタイムゾーン: {e}（Windows では pip install tzdata が必要です）")
+        w = WorldClockWall(zones, args.world_factor, args.world_columns, args.world_theme, readout_format)
+    else:
+        w = MainWindow(sweep_fps=args.sweep, profile=profile, readout_format=readout_format,
+                       metrics=Metrics() if args.metrics else None, metrics_file=args.metrics_file,
+                       renderer=args.renderer, hand_atlas_mb=args.hand_atlas)
     w.show()
     sys.exit(app.exec())
 
@@ -0,0 +1,286 @@
+# -*- coding: utf-8 -*-
+"""描画コストのヘッドレス・ベンチマーク
+
+Qt: QT_QPA_PLATFORM=offscreen で ClockWidget を QImage へ N フレーム描画し、
+倍率 [1.0, 1.5, 2.0, 2.5] × ライト/ダーク × 最悪ケースの針角度で計測する。
+針は線の描画（paint）と針アトラスからの転送（atlas）の両方を測る。
+Tk: 表示（$DISPLAY 等）があれば draw_clock / 針の更新を計測し、なければスキップする。
+エンジン: clock_engine のフレーム生成（時刻 → 針位置 → 座標と差分）だけを GUI なしで計測する。
+結果は JSON に保存し、--compare で以前の結果と比較できる。
+
+    python benchmark_clock.py --frames 300 --output bench.json
+    python benchmark_clock.py --compare bench_before.json
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import subprocess
+import tracemalloc
+
+# Qt を import する前にオフスクリーン描画を指定する（明示指定があればそれを優先）
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+try:
+    import resource  # Windows には無い
+except ImportError:
+    resource = None
+
+FACTORS = [1.0, 1.5, 2.0, 2.5]
+ENGINE_FRAMES = 1_000_000
+ENGINE_CYCLE_S = 12 * 3600  # 時刻は12時間分を1秒刻みで巡回する（全針位置を通る）
+ENGINE_SWEEP_STEPS = 3600
+THEMES = ["light", "dark"]
+DEFAULT_OUTPUT = "benchmark_results.json"
+
+# 最悪ケースの針位置（時・分・秒の表インデックス）。
+# 斜め方向は外接矩形/アンチエイリアス面積が最大になるため、斜めの組み合わせを巡回する
+WORST_CASE_INDICES = [
+    (90, 37, 52),    # 1:30 / 37分 / 52秒
+    (270, 7, 22),    # 4:30 / 7分 / 22秒
+    (450, 52, 8),    # 7:30 / 52分 / 8秒
+    (630, 22, 37),   # 10:30 / 22分 / 37秒
+]
+
+
+def percentiles(samples):
+    ordered = sorted(samples)
+    def pick(q):
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+    return {
+        "mean": sum(ordered) / len(ordered),
+        "p50": pick(0.50),
+        "p90": pick(0.90),
+        "p99": pick(0.99),
+        "max": ordered[-1],
+    }
+
+
+def peak_rss_kb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS はバイト、Linux は KB
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def measure(render, frames):
+    """render(i) を frames 回計測。時間計測とメモリ計測は干渉するため別パスで行う"""
+    render(0)  # ウォームアップ（文字盤キャッシュ生成など）
+    times_ms = []
+    for i in range(frames):
+        started = time.perf_counter()
+        render(i)
+        times_ms.append((time.perf_counter() - started) * 1000)
+
+    # 割り当ては tracemalloc のスナップショットをフレームごとに比較する（tracemalloc 自身の分は除く）。
+    # 残留（フレーム後も生きているブロック/バイトの増分）と、フレーム中の一時的な割り当てのピークを記録する
+    alloc_frames = max(1, min(frames, 50))
+    filters = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, "<unknown>")]
+    tracemalloc.start()
+    peak_bytes = 0
+    net_blocks = net_bytes = 0
+    for i in range(alloc_frames):
+        before = tracemalloc.take_snapshot().filter_traces(filters)
+        tracemalloc.reset_peak()
+        base, _ = tracemalloc.get_traced_memory()
+        render(i)
+        _, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot().filter_traces(filters)
+        peak_bytes = max(peak_bytes, peak - base)
+        for stat in after.compare_to(before, "filename"):
+            net_blocks += stat.count_diff
+            net_bytes += stat.size_diff
+    tracemalloc.stop()
+
+    result = {"frames": frames, "ms": percentiles(times_ms)}
+    result["alloc_net_blocks_per_frame"] = net_blocks / alloc_frames
+    result["alloc_net_bytes_per_frame"] = net_bytes / alloc_frames
+    result["alloc_peak_bytes_per_frame"] = peak_bytes
+    return result
+
+
+# ---------------------- エンジン（GUI なし） ----------------------
+def bench_engine(frames):
+    from clock_time import take_snapshot
+    from clock_engine import ClockEngine
+    from clock_geometry import dial_geometry
+
+    # スナップショット（localtime）は事前に作り、フレーム生成だけを測る
+    base = int(time.time()) // ENGINE_CYCLE_S * ENGINE_CYCLE_S
+    snapshots = [take_snapshot(base + i + 0.25) for i in range(min(frames, ENGINE_CYCLE_S))]
+    results = {}
+    for mode, sweep_steps in (("second", 0), ("sweep", ENGINE_SWEEP_STEPS)):
+        engine = ClockEngine(dial_geometry(200, 200, 190, 155, 10, 6), (100, 150, 175))
+        frame = engine.frame
+        count = len(snapshots)
+        changed = 0
+        started = time.perf_counter()
+        for i in range(frames):
+            changed += frame(snapshots[i % count], sweep_steps).changed & 7 != 0
+        elapsed = time.perf_counter() - started
+        results[mode] = {
+            "frames": frames,
+            "ns_per_frame": elapsed / frames * 1e9,
+            "frames_per_s": frames / elapsed,
+            "changed_frames": changed,
+        }
+        print(f"[engine] {mode:6s} {results[mode]['frames_per_s']:,.0f} frames/s "
+              f"({results[mode]['ns_per_frame']:.0f} ns/frame)")
+    return results
+
+
+# ---------------------- Qt ----------------------
+def bench_qt(frames):
+    from PySide6.QtGui import QImage
+    from PySide6.QtWidgets import QApplication
+    import app_analog_clock_2 as qt_clock
+
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    themes = qt_clock.load_themes()
+    steps = (qt_clock.HOUR_STEPS, qt_clock.MINUTE_STEPS, qt_clock.SECOND_STEPS)
+    results = []
+    for factor in FACTORS:
+        for theme_name in THEMES:
+            for op, atlas_mb in (("paint", 0), ("atlas", qt_clock.HAND_ATLAS_LIMIT_MB)):
+                widget = qt_clock.ClockWidget(None, factor)
+                widget.set_theme(themes[theme_name])
+                widget.resize(widget.sizeHint())  # 大きさは自由なので推奨サイズ（倍率どおり）に合わせる
+                widget.set_hand_atlas(atlas_mb)
+                image = QImage(widget.size(), QImage.Format_ARGB32_Premultiplied)
+
+                def render(i, widget=widget, image=image):
+                    indices = WORST_CASE_INDICES[i % len(WORST_CASE_INDICES)]
+                    widget.move_hands(tuple(zip(indices, steps)))
+                    widget.render(image)
+
+                result = measure(render, frames)
+                result.update({"factor": factor, "theme": theme_name, "op": op, "hands": widget.hand_mode()})
+                results.append(result)
+                print(f"[qt] factor={factor:.1f} theme={theme_name:5s} {op:5s} ({result['hands']}) "
+                      f"p50={result['ms']['p50']:.3f}ms p99={result['ms']['p99']:.3f}ms "
+                      f"net_blocks/frame={result['alloc_net_blocks_per_frame']:.1f} peak={result['alloc_peak_bytes_per_frame']}B")
+                widget.deleteLater()
+    app.processEvents()
+    return results
+
+
+# ---------------------- Tk ----------------------
+def bench_tk(frames):
+    import tkinter as tk
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print(f"[tk] skipped: {e}")
+        return {"skipped": str(e)}
+
+    import app_analog_clock as tk_clock
+    results = []
+    try:
+        for factor in FACTORS:
+            for theme_name in THEMES:
+                tk_clock.root = root
+                tk_clock.factor = factor
+                tk_clock.is_dark_theme = (theme_name == "dark")
+                tk_clock.apply_factor_settings()
+                canvas = tk.Canvas(root, width=int(400 * factor), height=int(400 * factor))
+                canvas.pack()
+                tk_clock.canvas = canvas
+
+                def build(i):
+                    tk_clock.draw_clock(canvas)
+                    tk_clock.cancel_jobs()
+                    root.update_idletasks()
+
+                def move(i):
+                    # 3本すべての針を動かす最悪ケース（前回位置を忘れさせて必ず coords を発行）
+                    tk_clock.current_engine().reset_hands()
+                    tk_clock.move_hands(canvas)
+                    root.update_idletasks()
+
+                for name, render in (("draw_clock", build), ("move_hands", move)):
+                    result = measure(render, frames)
+                    result.update({"factor": factor, "theme": theme_name, "op": name})
+                    results.append(result)
+                    print(f"[tk] factor={factor:.1f} theme={theme_name:5s} {name:10s} "
+                          f"p50={result['ms']['p50']:.3f}ms p99={result['ms']['p99']:.3f}ms")
+                canvas.destroy()
+    finally:
+        tk_clock.cancel_jobs()
+        root.destroy()
+    return results
+
+
+# ---------------------- 結果の保存/比較 ----------------------
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip() or None
+    except Exception:
+        return None
+
+
+def compare(previous, current):
+    def index(results):
+        if not isinstance(results, list):
+            return {}
+        return {(r["factor"], r["theme"], r.get("op", "paint")): r for r in results}
+    for mode, after in (current.get("engine") or {}).items():
+        before = (previous.get("engine") or {}).get(mode)
+        if before:
+            b, a = before["frames_per_s"], after["frames_per_s"]
+            print(f"[compare:engine] {mode:6s} {b:,.0f} -> {a:,.0f} frames/s ({(a - b) / b * 100:+.1f}%)")
+    for backend in ("qt", "tk"):
+        before, after = index(previous.get(backend)), index(current.get(backend))
+        for key in sorted(after):
+            if key in before:
+                b, a = before[key]["ms"]["p50"], after[key]["ms"]["p50"]
+                change = (a - b) / b * 100 if b else 0.0
+                print(f"[compare:{backend}] factor={key[0]:.1f} theme={key[1]:5s} {key[2]:10s} "
+                      f"p50 {b:.3f}ms -> {a:.3f}ms ({change:+.1f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="アナログ時計の描画ベンチマーク")
+    parser.add_argument("--frames", type=int, default=200, help="1条件あたりの計測フレーム数")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="結果を保存する JSON ファイル")
+    parser.add_argument("--compare", metavar="JSON", help="比較対象の以前の結果")
+    parser.add_argument("--skip-qt", action="store_true")
+    parser.add_argument("--skip-tk", action="store_true")
+    parser.add_argument("--engine-frames", type=int, default=ENGINE_FRAMES, help="エンジン計測のフレーム数（0 でスキップ）")
+    args = parser.parse_args()
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "qpa": os.environ.get("QT_QPA_PLATFORM"),
+            "frames": args.frames,
+        },
+    }
+    if args.engine_frames > 0:
+        report["engine"] = bench_engine(args.engine_frames)
+    if not args.skip_qt:
+        report["qt"] = bench_qt(args.frames)
+    if not args.skip_tk:
+        report["tk"] = bench_tk(args.frames)
+    report["meta"]["peak_rss_kb"] = peak_rss_kb()
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"保存: {args.output} (peak RSS={report['meta']['peak_rss_kb']} KB)")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare(json.load(f), report)
+
+
+if __name__ == "__main__":
+    main()
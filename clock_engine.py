@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+"""時計エンジン: 時刻 → 針の位置 → 座標と前フレームからの変化（GUI 非依存・Tk/Qt 共通）
+
+描画側（Tk のキャンバス / Qt の ClockWidget）は毎フレーム ClockEngine.frame() が返す
+ClockFrame を読むだけにする。針の位置は clock_geometry の表インデックス (index, steps) で、
+先端座標は表引きのみ（三角関数は使わない）。表示を作らずに1フレームあたりの処理を計測できる。
+
+    engine = ClockEngine(dial_geometry(...), (100, 150, 175))
+    frame = engine.frame(take_snapshot())
+    if frame.changed & CHANGED_SECOND:
+        ...  # frame.ends[HAND_SECOND] へ秒針を動かす
+"""
+
+from clock_geometry import HOUR_STEPS, MINUTE_STEPS, SECOND_STEPS
+
+# 針の番号（positions/ends の並び）
+HAND_HOUR = 0
+HAND_MINUTE = 1
+HAND_SECOND = 2
+# ClockFrame.changed のビット
+CHANGED_HOUR = 1 << HAND_HOUR
+CHANGED_MINUTE = 1 << HAND_MINUTE
+CHANGED_SECOND = 1 << HAND_SECOND
+CHANGED_HANDS = CHANGED_HOUR | CHANGED_MINUTE | CHANGED_SECOND
+CHANGED_THEME = 1 << 3
+CHANGED_LAYOUT = 1 << 4  # 寸法（座標表）が変わった。静的な要素も置き直す
+CHANGED_ALL = CHANGED_HANDS | CHANGED_THEME | CHANGED_LAYOUT
+
+
+def sweep_positions(epoch, local, steps):
+    """スムーズ（スイープ）表示の針位置。秒針/分針は一周 steps 分割、時針は1分単位"""
+    seconds = local.tm_sec + (epoch % 1.0)
+    minutes = local.tm_min + seconds / 60.0
+    hour_idx = (local.tm_hour % 12) * 60 + local.tm_min
+    return (
+        (hour_idx, HOUR_STEPS),
+        (int(minutes * steps / 60), steps),
+        (int(seconds * steps / 60), steps),
+    )
+
+
+class ClockFrame:
+    """1フレーム分の描画内容。描画側はこれを読むだけで、書き換えない"""
+    __slots__ = ("epoch", "positions", "previous", "ends", "changed", "theme")
+
+    def __init__(self, epoch, positions, previous, ends, changed, theme):
+        self.epoch = epoch
+        self.positions = positions  # 針ごとの (表インデックス, 一周の分割数)
+        self.previous = previous    # 前フレームの positions（最初のフレーム/置き直し後は None）
+        self.ends = ends            # 針ごとの先端座標 (x, y)（座標表の座標系）
+        self.changed = changed      # CHANGED_* のビット和
+        self.theme = theme          # 現在のテーマ（描画側のオブジェクトをそのまま持つ）
+
+    def hand_changed(self, hand):
+        return bool(self.changed & (1 << hand))
+
+    def angle(self, hand):
+        """12時起点・時計回りの角度（度）"""
+        index, steps = self.positions[hand]
+        return 360.0 * index / steps
+
+
+class ClockEngine:
+    """前フレームの針位置とテーマを保持し、次のフレームとの差分を求める"""
+    __slots__ = ("geometry", "lengths", "theme", "_positions", "_ends", "_pending", "_tables")
+
+    def __init__(self, geometry, lengths, theme=None):
+        self.geometry = geometry    # clock_geometry.DialGeometry
+        self.lengths = tuple(lengths)  # 時・分・秒の針の長さ
+        self.theme = theme
+        self._positions = None
+        self._ends = None
+        self._pending = CHANGED_ALL  # 次のフレームに加える変化（最初は全要素）
+        self._tables = {}  # (針, 分割数) → 先端座標表 (xs, ys)
+
+    def set_layout(self, geometry, lengths):
+        """寸法が変わった（倍率変更など）。次のフレームは全要素を変化扱いにする"""
+        self.geometry = geometry
+        self.lengths = tuple(lengths)
+        self._tables = {}
+        self.invalidate()
+
+    def set_theme(self, theme):
+        if theme is not self.theme:
+            self.theme = theme
+            self._pending |= CHANGED_THEME
+
+    def invalidate(self):
+        """前フレームを忘れ、全要素を変化扱いにする（寸法が変わったとき）"""
+        self._positions = None
+        self._pending = CHANGED_ALL
+
+    def reset_hands(self):
+        """針の前フレームだけを忘れる（描画側で針を作り直したとき）。静的な要素は置き直さない"""
+        self._positions = None
+
+    def frame(self, snapshot, sweep_steps=0):
+        """snapshot（clock_time.TimeSnapshot）のフレーム。sweep_steps > 0 ならスイープ表示"""
+        epoch, local = snapshot
+        if sweep_steps:
+            positions = sweep_positions(epoch, local, sweep_steps)
+        else:
+            # 1秒ステップの針位置 ((時, 720), (分, 60), (秒, 60))
+            minute = local.tm_min
+            positions = (((local.tm_hour % 12) * 60 + minute, HOUR_STEPS), (minute, MINUTE_STEPS),
+                         (local.tm_sec, SECOND_STEPS))
+        return self.frame_for(positions, epoch)
+
+    def frame_for(self, positions, epoch=0.0):
+        """針位置を直接与えてフレームを作る（ベンチマーク/最悪ケースの再現用）"""
+        previous = self._positions
+        changed = self._pending
+        if previous is None:
+            changed |= CHANGED_HANDS
+            ends = [None, None, None]
+        else:
+            if positions[0] != previous[0]:
+                changed |= CHANGED_HOUR
+            if positions[1] != previous[1]:
+                changed |= CHANGED_MINUTE
+            if positions[2] != previous[2]:
+                changed |= CHANGED_SECOND
+            if not changed:
+                # 同じ秒の2回目以降（ミリ秒表示の再描画など）は前フレームの座標をそのまま使う
+                return ClockFrame(epoch, positions, previous, self._ends, 0, self.theme)
+            ends = list(self._ends)
+        # 先端座標は動いた針だけ表から引き直す
+        for hand in range(3):
+            if changed & (1 << hand):
+                index, steps = positions[hand]
+                xs, ys = self._table(hand, steps)
+                index %= steps
+                ends[hand] = (xs[index], ys[index])
+        ends = tuple(ends)
+        self._positions = positions
+        self._ends = ends
+        self._pending = 0
+        return ClockFrame(epoch, positions, previous, ends, changed, self.theme)
+
+    def _table(self, hand, steps):
+        key = (hand, steps)
+        table = self._tables.get(key)
+        if table is None:
+            table = self._tables[key] = self.geometry.hand_table(self.lengths[hand], steps)
+        return table
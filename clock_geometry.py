@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""文字盤と針の幾何テーブル（GUI 非依存・Tk/Qt 共通）
+
+寸法ごとに、目盛り60本の線分・数字12個の位置・針先端の座標表を一度だけ計算して保持する。
+描画側は毎フレーム三角関数を計算せず、インデックスで表を引くだけにする。
+角度はすべて 12 時起点・時計回り。
+"""
+
+import math
+from array import array
+from functools import lru_cache
+
+SECOND_STEPS = 60
+MINUTE_STEPS = 60
+HOUR_STEPS = 720  # 12時間 × 60分
+
+
+@lru_cache(maxsize=None)
+def unit_circle(steps):
+    """一周を steps 分割した単位ベクトル表 (xs, ys)。画面座標系（下が+Y）"""
+    xs = array('d')
+    ys = array('d')
+    for i in range(steps):
+        angle = 2.0 * math.pi * i / steps
+        xs.append(math.sin(angle))
+        ys.append(-math.cos(angle))
+    return xs, ys
+
+
+class DialGeometry:
+    """1つの寸法に対する文字盤/針の座標表"""
+    __slots__ = ("cx", "cy", "radius", "ticks", "major_ticks", "minor_ticks", "numbers", "_hands")
+
+    def __init__(self, cx, cy, radius, number_distance, major_tick_len, minor_tick_len):
+        self.cx = cx
+        self.cy = cy
+        self.radius = radius
+        xs, ys = unit_circle(60)
+        # ticks: 0〜59 番の線分を (x0, y0, x1, y1) の順に平坦に並べる
+        self.ticks = array('d')
+        self.major_ticks = array('d')
+        self.minor_ticks = array('d')
+        for i in range(60):
+            is_major = (i % 5 == 0)
+            inner = radius - (major_tick_len if is_major else minor_tick_len)
+            segment = (cx + inner * xs[i], cy + inner * ys[i], cx + radius * xs[i], cy + radius * ys[i])
+            self.ticks.extend(segment)
+            (self.major_ticks if is_major else self.minor_ticks).extend(segment)
+        # numbers: 1〜12 の中心座標を (x, y) の順に平坦に並べる
+        nxs, nys = unit_circle(12)
+        self.numbers = array('d')
+        for i in range(1, 13):
+            self.numbers.extend((cx + number_distance * nxs[i % 12], cy + number_distance * nys[i % 12]))
+        self._hands = {}
+
+    def tick(self, i):
+        return tuple(self.ticks[i * 4:i * 4 + 4])
+
+    def number(self, i):
+        """数字 i（1〜12）の中心座標"""
+        return self.numbers[(i - 1) * 2], self.numbers[(i - 1) * 2 + 1]
+
+    def hand_table(self, length, steps):
+        """長さ length の針先端の座標表 (xs, ys)。steps は一周の分割数（60/720/サブ秒用など）"""
+        key = (length, steps)
+        table = self._hands.get(key)
+        if table is None:
+            uxs, uys = unit_circle(steps)
+            table = (
+                array('d', (self.cx + length * x for x in uxs)),
+                array('d', (self.cy + length * y for y in uys)),
+            )
+            self._hands[key] = table
+        return table
+
+    def hand_end(self, length, steps, index):
+        xs, ys = self.hand_table(length, steps)
+        index %= steps
+        return xs[index], ys[index]
+
+
+@lru_cache(maxsize=32)
+def dial_geometry(cx, cy, radius, number_distance, major_tick_len, minor_tick_len):
+    """寸法ごとに共有される DialGeometry を返す"""
+    return DialGeometry(cx, cy, radius, number_distance, major_tick_len, minor_tick_len)
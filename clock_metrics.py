@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+"""計測（任意）: 固定長リングバッファ・カウンタ・ヒストグラムと cProfile の取得（GUI 非依存）
+
+「時計がカクつく」報告の調査用。描画時間・タイマーの遅れ・秒の飛び/重複・再スタイル回数・
+秒針音の予定誤差などを記録し、JSON に書き出す。無効時は呼び出し側が metrics=None として
+記録処理そのものを行わない。
+"""
+
+import io
+import json
+import time
+import pstats
+import cProfile
+import platform
+from array import array
+
+from clock_settings import write_atomic
+
+METRICS_HISTORY = 3600  # 系列ごとに保持するサンプル数（1Hz なら1時間、60fps なら1分）
+# ヒストグラムの区切り（ms）。最後の区切りを超えたものは overflow に数える
+HISTOGRAM_BOUNDS_MS = (0.25, 0.5, 1, 2, 4, 8, 16, 33, 66, 100, 250, 500, 1000)
+
+
+class RingBuffer:
+    """容量固定の float 系列。古いものから上書きする"""
+    __slots__ = ("capacity", "total", "_data", "_next")
+
+    def __init__(self, capacity=METRICS_HISTORY):
+        self.capacity = capacity
+        self.total = 0  # これまでに追加した総数（上書き分を含む）
+        self._data = array('d', bytes(8 * capacity))
+        self._next = 0
+
+    def append(self, value):
+        self._data[self._next] = value
+        self._next = (self._next + 1) % self.capacity
+        self.total += 1
+
+    def __len__(self):
+        return min(self.total, self.capacity)
+
+    def values(self):
+        """古い順"""
+        if self.total < self.capacity:
+            return self._data[:self._next].tolist()
+        return (self._data[self._next:] + self._data[:self._next]).tolist()
+
+    def summary(self):
+        ordered = sorted(self.values())
+        if not ordered:
+            return {"count": 0, "total": self.total}
+        def pick(q):
+            return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+        return {
+            "count": len(ordered),
+            "total": self.total,
+            "mean": sum(ordered) / len(ordered),
+            "p50": pick(0.50),
+            "p90": pick(0.90),
+            "p99": pick(0.99),
+            "max": ordered[-1],
+        }
+
+    def histogram(self, bounds=HISTOGRAM_BOUNDS_MS):
+        counts = [0] * (len(bounds) + 1)
+        for value in self.values():
+            for i, bound in enumerate(bounds):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            else:
+                counts[-1] += 1
+        return {"bounds": list(bounds), "counts": counts[:-1], "overflow": counts[-1]}
+
+
+class Metrics:
+    """名前付きの系列（ms）とカウンタ"""
+
+    def __init__(self, capacity=METRICS_HISTORY):
+        self.capacity = capacity
+        self.started = time.time()
+        self.series = {}
+        self.counters = {}
+        self._profiler = None
+
+    def record(self, name, value):
+        series = self.series.get(name)
+        if series is None:
+            series = self.series[name] = RingBuffer(self.capacity)
+        series.append(value)
+
+    def count(self, name, n=1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def summary(self, name):
+        series = self.series.get(name)
+        return series.summary() if series is not None else {"count": 0, "total": 0}
+
+    def report(self, meta=None):
+        return {
+            "meta": dict(meta or {}, started=self.started, dumped=time.time(),
+                         python=platform.python_version(), platform=platform.platform()),
+            "counters": dict(self.counters),
+            "series": {
+                name: dict(series.summary(), histogram=series.histogram())
+                for name, series in sorted(self.series.items())
+            },
+        }
+
+    def dump(self, path, meta=None):
+        write_atomic(path, json.dumps(self.report(meta), ensure_ascii=False, indent=2))
+
+    # -------- cProfile（取得期間の開始/終了は呼び出し側のタイマーで行う） --------
+    def is_profiling(self):
+        return self._profiler is not None
+
+    def start_profile(self):
+        if self._profiler is not None:
+            return False
+        self._profiler = cProfile.Profile()
+        self._profiler.enable()
+        return True
+
+    def stop_profile(self, path, top=15):
+        """取得を終えて pstats 形式で保存し、累積時間の上位を文字列で返す"""
+        if self._profiler is None:
+            return ""
+        profiler, self._profiler = self._profiler, None
+        profiler.disable()
+        profiler.dump_stats(str(path))
+        self.count("profiles")
+        out = io.StringIO()
+        stats = pstats.Stats(profiler, stream=out)
+        stats.sort_stats("cumulative").print_stats(top)
+        return out.getvalue()
@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+"""ウィンドウ位置の保存/復元（ホストごと・共有フォルダ向け・GUI 非依存・Tk/Qt 共通）
+
+共有のネットワークフォルダから多数の端末で起動しても互いの書き込みが衝突しないよう、
+ホストごとに別のファイル（追記専用のジャーナル）へ記録する。
+
+    <app_name>.positions/<ホスト名>-<CRC32>.pos   （ホスト名は英数字以外を "_" に。CRC32 は元のホスト名）
+    <ホスト名>\\t<x>\\t<y>\\t<epoch 秒>\\t<CRC32>\\n   （1回の保存につき1行を追記）
+
+- 保存は1行の追記（O_APPEND）だけで、他のホストの記録は読まない/書き直さない
+- 起動時は自ホストのファイルの末尾 TAIL_BYTES だけを読み、最後の正しい行を使う（ホスト数に依らない）
+- 改行で終わっていない行（書き込み途中）・フィールド数/CRC の合わない行（壊れた行）は読み飛ばす。
+  追記の前に末尾が改行でなければ改行を補い、切れた行の続きに書かない
+- ファイルが COMPACT_BYTES を超えたら、最後の1行だけのファイルに置き換える（一時ファイル＋置き換え）
+"""
+
+import os
+import re
+import time
+import zlib
+from pathlib import Path
+
+from clock_settings import HOSTNAME, SAVE_DELAY_S, SETTINGS_DIR, DelayedWriter, write_atomic
+
+POSITION_SUFFIX = ".pos"
+TAIL_BYTES = 4096          # 起動時に読む末尾のバイト数（1行は 100 バイト未満）
+COMPACT_BYTES = 16 * 1024  # ジャーナルがこれを超えたら最後の1行に詰める
+
+
+def host_file_name(host=HOSTNAME):
+    """ホスト名をファイル名に使える形へ
+
+    読みやすさのため英数字以外を "_" に置き換え小文字にするが、それだけでは "PC.A" と "pc_a" が
+    同じ名前になり、一方の詰め直しで他方の記録を消してしまう。元のホスト名の CRC32 を付けて区別する。
+    """
+    safe = re.sub(r"[^0-9a-z._-]", "_", host.lower())
+    return f"{safe}-{zlib.crc32(host.encode('utf-8')):08x}{POSITION_SUFFIX}"
+
+
+def format_record(host, position, when=None):
+    x, y = position
+    payload = f"{host}\t{int(x)}\t{int(y)}\t{int(time.time() if when is None else when)}"
+    return f"{payload}\t{zlib.crc32(payload.encode('utf-8')):08x}\n"
+
+
+def parse_record(line, host=HOSTNAME):
+    """1行（改行を除く）を [x, y] に。壊れている/別ホストの行なら None"""
+    payload, _, crc = line.rpartition("\t")
+    fields = payload.split("\t")
+    if len(fields) != 4 or fields[0] != host:
+        return None
+    try:
+        if int(crc, 16) != zlib.crc32(payload.encode("utf-8")):
+            return None
+        return [int(fields[1]), int(fields[2])]
+    except ValueError:
+        return None
+
+
+def read_position(path, host=HOSTNAME):
+    """ジャーナルの末尾から最後の正しい記録を探す。無ければ None"""
+    try:
+        with open(path, "rb") as f:
+            size = f.seek(0, os.SEEK_END)
+            start = max(0, size - TAIL_BYTES)
+            f.seek(start)
+            data = f.read()
+    except OSError:
+        return None
+    lines = data.split(b"\n")
+    lines.pop()  # 改行で終わっていない最後の断片（書き込み途中）。正常なら空
+    if start > 0 and lines:
+        lines.pop(0)  # 途中から読んだ最初の行
+    for raw in reversed(lines):
+        position = parse_record(raw.decode("utf-8", "replace").rstrip("\r"), host)
+        if position is not None:
+            return position
+    return None
+
+
+class PositionStore(DelayedWriter):
+    """このホストのウィンドウ位置。移動中の連続した変更は最後の1回だけを追記する"""
+
+    def __init__(self, directory, host=HOSTNAME, delay_s=SAVE_DELAY_S, legacy=None):
+        super().__init__(delay_s)
+        self.host = host
+        self.path = Path(directory) / host_file_name(host)
+        self._position = read_position(self.path, host)
+        if self._position is None and legacy is not None:
+            # 旧形式（設定ファイルのホストごとの値）は記録が無いときの初期値としてだけ使う
+            try:
+                self._position = [int(v) for v in legacy][:2]
+            except (TypeError, ValueError):
+                pass
+        self._start(f"positions:{self.path.name}")
+
+    def get(self):
+        with self._cond:
+            return None if self._position is None else list(self._position)
+
+    def set(self, position):
+        position = [int(position[0]), int(position[1])]
+        with self._cond:
+            if position == self._position:
+                return
+            self._position = position
+            self._touch()
+
+    # -------- 書き込み --------
+    def _snapshot(self):
+        return format_record(self.host, self._position).encode("utf-8")
+
+    def _write(self, record):
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "ab+") as f:
+                size = f.seek(0, os.SEEK_END)
+                if size:
+                    f.seek(size - 1)
+                    if f.read(1) != b"\n":
+                        # 書き込み途中で切れた行の続きにしない（つながると新しい記録まで壊れる）
+                        record = b"\n" + record
+                # 1回の write で1行を追記する（他の書き込みと行が混ざらない）
+                f.write(record)
+                size = f.tell()
+        except OSError as e:
+            print(f"[warn] window position not saved: {e}")
+            return
+        if size > COMPACT_BYTES:
+            try:
+                write_atomic(self.path, record.lstrip(b"\n"))
+            except OSError:
+                pass  # 別のプロセスが開いている等。次の保存で再び詰める
+
+
+def open_positions(app_name, legacy=None, directory=SETTINGS_DIR):
+    """アプリごとの位置フォルダ <app_name>.positions のうち、このホストの記録を開く"""
+    return PositionStore(Path(directory) / f"{app_name}.positions", legacy=legacy)
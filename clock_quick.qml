@@ -0,0 +1,149 @@
+// Qt Quick（シーングラフ）版の時計（app_analog_clock_2.QuickClockWidget から読み込む）
+// 文字盤（外周・目盛・数字）は静的なノードとして作り、レイヤーで1枚のテクスチャにまとめる。
+// 毎秒の更新は3本の針の回転角（Rotation の angle）だけで、再描画はシーングラフに任せる。
+// 寸法/色/位置はすべて Python 側からプロパティで渡す（定数は app_analog_clock_2.py に一元化）。
+import QtQuick
+
+Item {
+    id: root
+
+    // 寸法（論理座標 400x400。factor を掛けてピクセルに）。倍率は短辺から決まり（maxFactor まで）、正方形を中央に置く
+    property real logicalSize: 400
+    property real maxFactor: 4
+    readonly property real factor: Math.min(width, height, Math.round(logicalSize * maxFactor)) / logicalSize
+    readonly property real faceX: Math.round((width - logicalSize * factor) / 2)
+    readonly property real faceY: Math.round((height - logicalSize * factor) / 2)
+    // 文字盤を作った倍率。リサイズ中は据え置いて拡縮で済ませ、止まったら Python 側が factor に揃える
+    property real dialFactor: 1.0
+    property real centerX: 200
+    property real centerY: 200
+    property real radius: 190
+    property real tickMajorLength: 10
+    property real tickMinorLength: 6
+    property var numberPositions: []   // [[x, y], ...]（1〜12）
+    property int numberPointSize: 32
+    // 針: [長さ, 幅] を時・分・秒の順に
+    property var handSpecs: [[100, 8], [150, 5], [175, 2]]
+    property real hourAngle: 0
+    property real minuteAngle: 0
+    property real secondAngle: 0
+
+    // 色（テーマ）
+    property color bgColor: "white"
+    property color lineColor: "black"
+    property color numberColor: "black"
+    property color tickColor: "gray"
+    property color secondColor: "red"
+
+    // デジタル表示と計測オーバーレイ
+    property string readoutText: ""
+    property font readoutFont
+    property real readoutX: 4
+    property real readoutY: 6
+    property string hudText: ""
+
+    Rectangle {
+        anchors.fill: parent
+        color: root.bgColor
+    }
+
+    // 静的な文字盤。dialFactor/テーマが変わったときだけテクスチャを作り直す
+    Item {
+        id: dial
+        x: root.faceX
+        y: root.faceY
+        width: root.logicalSize * root.dialFactor
+        height: width
+        transformOrigin: Item.TopLeft
+        scale: root.factor / root.dialFactor
+        layer.enabled: true
+        layer.smooth: true
+
+        Rectangle {
+            x: (root.centerX - root.radius) * root.dialFactor
+            y: (root.centerY - root.radius) * root.dialFactor
+            width: root.radius * 2 * root.dialFactor
+            height: width
+            radius: width / 2
+            color: "transparent"
+            border.color: root.lineColor
+            border.width: 3 * root.dialFactor
+            antialiasing: true
+        }
+
+        Repeater {
+            model: 60
+            Rectangle {
+                readonly property bool major: index % 5 === 0
+                width: (major ? 3 : 1) * root.dialFactor
+                height: (major ? root.tickMajorLength : root.tickMinorLength) * root.dialFactor
+                x: root.centerX * root.dialFactor - width / 2
+                y: (root.centerY - root.radius) * root.dialFactor
+                color: root.tickColor
+                antialiasing: true
+                transform: Rotation {
+                    origin.x: width / 2
+                    origin.y: root.radius * root.dialFactor
+                    angle: index * 6
+                }
+            }
+        }
+
+        Repeater {
+            model: root.numberPositions
+            Text {
+                text: index + 1
+                color: root.numberColor
+                font.family: "Helvetica"
+                font.pointSize: Math.max(1, Math.round(root.numberPointSize * root.dialFactor))
+                x: modelData[0] * root.dialFactor - width / 2
+                y: modelData[1] * root.dialFactor - height / 2
+            }
+        }
+    }
+
+    // 針（時・分・秒）。中心から上向きに置き、下端を軸に回転させる
+    Repeater {
+        model: 3
+        Rectangle {
+            readonly property real length: root.handSpecs[index][0] * root.factor
+            width: root.handSpecs[index][1] * root.factor
+            height: length
+            x: root.faceX + root.centerX * root.factor - width / 2
+            y: root.faceY + root.centerY * root.factor - length
+            color: index === 2 ? root.secondColor : root.lineColor
+            antialiasing: true
+            transform: Rotation {
+                origin.x: width / 2
+                origin.y: length
+                angle: index === 0 ? root.hourAngle : index === 1 ? root.minuteAngle : root.secondAngle
+            }
+        }
+    }
+
+    Text {
+        x: root.readoutX
+        y: root.readoutY
+        text: root.readoutText
+        font: root.readoutFont
+        color: root.numberColor
+    }
+
+    Rectangle {
+        visible: root.hudText !== ""
+        x: 4
+        y: root.height - height - 4
+        width: hud.implicitWidth + 8
+        height: hud.implicitHeight + 8
+        color: Qt.rgba(root.bgColor.r, root.bgColor.g, root.bgColor.b, 0.86)
+        Text {
+            id: hud
+            x: 4
+            y: 4
+            text: root.hudText
+            color: root.numberColor
+            font.family: "monospace"
+            font.pixelSize: 11
+        }
+    }
+}
@@ -0,0 +1,223 @@
+# -*- coding: utf-8 -*-
+"""設定の保存/復元（GUI 非依存・Tk/Qt 共通）
+
+起動時に一度だけ読み込み、以降はメモリ上の値を参照する。変更は即座には書かず、
+最後の変更から SAVE_DELAY_S 経ってからバックグラウンドのスレッドでまとめて書き込む
+（スライダーのドラッグやウィンドウ移動の連続した変更は1回の書き込みになる）。
+書き込みは一時ファイル＋置き換えで行い、途中まで書かれたファイルを残さない。
+端末ごとに異なる値はホスト名ごとに保持する（ウィンドウ位置は clock_positions のホストごとのファイル）。
+
+    {"version": 1, "values": {...}, "hosts": {"<ホスト名>": {...}}}
+"""
+
+import os
+import csv
+import json
+import time
+import atexit
+import socket
+import tempfile
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+
+SETTINGS_VERSION = 1
+SETTINGS_DIR = Path(__file__).parent
+SAVE_DELAY_S = 1.0  # 最後の変更からこの秒数だけ待ってから書き込む
+HOSTNAME = socket.gethostname()
+
+# 旧形式（起動ディレクトリの factor.txt / Tk 版の位置 CSV）。設定ファイルが無いときに一度だけ取り込む
+LEGACY_FACTOR_FILE = Path("factor.txt")
+LEGACY_POSITION_FILE = Path("window_position_app_analog_clock.csv")
+
+
+def write_atomic(path, data):
+    """一時ファイルへ書いてから置き換える（書き込み途中のファイルを読ませない）。
+    data は str（UTF-8 で書く）/ bytes、または開いたバイナリファイルへ書き込む関数
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=path.stem, suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            if callable(data):
+                data(f)
+            else:
+                f.write(data.encode("utf-8") if isinstance(data, str) else data)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def read_legacy_settings(factor_file=LEGACY_FACTOR_FILE, position_file=LEGACY_POSITION_FILE):
+    """旧形式のファイルから (共通の値, ホストごとの値) を読む。None/無い/壊れている項目は無視"""
+    values = {}
+    hosts = {}
+    try:
+        if factor_file is not None:
+            values["factor"] = float(Path(factor_file).read_text())
+    except (OSError, ValueError):
+        pass
+    if position_file is None:
+        return values, hosts
+    try:
+        with open(position_file, newline="", encoding="utf_8_sig") as f:
+            for row in csv.reader(f):
+                if len(row) < 2:
+                    continue
+                # "+x+y"（負の座標は "+-10+20"）
+                parts = row[1].strip().lstrip("+").split("+")
+                if len(parts) == 2:
+                    hosts.setdefault(row[0], {})["position"] = [int(parts[0]), int(parts[1])]
+    except (OSError, ValueError, csv.Error):
+        pass
+    return values, hosts
+
+
+class DelayedWriter(ABC):
+    """変更はメモリ上で受け付け、最後の変更から delay_s 経ってからバックグラウンドのスレッドで書き込む。
+    派生クラスは _snapshot()（書き込む内容を取り出す。_cond を保持したまま呼ばれる）と
+    _write()（ディスクへ書く。UI スレッド以外から呼ばれる）を実装し、読み込みの後に _start() を呼ぶ
+    """
+
+    def __init__(self, delay_s=SAVE_DELAY_S):
+        self.delay_s = delay_s
+        self._dirty = False
+        self._changed_at = 0.0
+        self._closed = False
+        self._cond = threading.Condition()
+        self._write_lock = threading.Lock()  # 書き込みの順序を保つ（古い内容で上書きしない）
+        self._thread = None
+
+    def _start(self, name):
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def _touch(self):
+        self._dirty = True
+        self._changed_at = time.monotonic()
+        self._cond.notify()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._dirty and not self._closed:
+                    self._cond.wait()
+                # 変更が続いている間は待ち続け、最後の変更から delay_s 経ったら書く
+                while not self._closed:
+                    remaining = self._changed_at + self.delay_s - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                if self._closed:
+                    return  # 残りは close() の flush で書く
+            self.flush()
+
+    @abstractmethod
+    def _snapshot(self):
+        """書き込む内容（_cond を保持したまま呼ばれる）"""
+
+    @abstractmethod
+    def _write(self, data):
+        """_snapshot() の内容をディスクへ書く（失敗は派生クラスで報告する）"""
+
+    def flush(self):
+        """未保存の変更があれば今すぐ書く（終了時など）"""
+        with self._write_lock:
+            with self._cond:
+                if not self._dirty:
+                    return
+                data = self._snapshot()
+                self._dirty = False
+            self._write(data)
+
+    def close(self):
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+        self.flush()
+
+
+class SettingsStore(DelayedWriter):
+    """メモリ上の設定と、遅延・一括・アトミックな書き込み"""
+
+    def __init__(self, path, defaults=None, delay_s=SAVE_DELAY_S, legacy=None):
+        super().__init__(delay_s)
+        self.path = Path(path)
+        self._values = dict(defaults or {})
+        self._hosts = {}
+        self._load(legacy)
+        self._start(f"settings:{self.path.name}")
+
+    def _load(self, legacy):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                loaded = json.load(f)
+        except FileNotFoundError:
+            if legacy is not None:
+                values, hosts = legacy
+                self._values.update(values)
+                self._hosts.update(hosts)
+                self._dirty = bool(values or hosts)
+                self._changed_at = time.monotonic()
+            return
+        except (OSError, ValueError) as e:
+            print(f"[warn] settings ignored: {e}")
+            return
+        if not isinstance(loaded, dict):
+            print("[warn] settings ignored: top level must be an object")
+            return
+        if isinstance(loaded.get("values"), dict):
+            self._values.update(loaded["values"])
+        if isinstance(loaded.get("hosts"), dict):
+            self._hosts = {h: dict(v) for h, v in loaded["hosts"].items() if isinstance(v, dict)}
+
+    # -------- 読み書き（UI スレッドから呼ぶ。ディスク I/O はしない） --------
+    def get(self, key, default=None):
+        with self._cond:
+            return self._values.get(key, default)
+
+    def set(self, key, value):
+        with self._cond:
+            if self._values.get(key) == value and key in self._values:
+                return
+            self._values[key] = value
+            self._touch()
+
+    def get_host(self, key, default=None):
+        """このホストだけの値（ウィンドウ位置など）"""
+        with self._cond:
+            return self._hosts.get(HOSTNAME, {}).get(key, default)
+
+    # -------- 書き込み --------
+    def _serialize(self):
+        return json.dumps(
+            {"version": SETTINGS_VERSION, "values": self._values, "hosts": self._hosts},
+            ensure_ascii=False, indent=2, sort_keys=True,
+        )
+
+    def _snapshot(self):
+        return self._serialize()
+
+    def _write(self, text):
+        try:
+            write_atomic(self.path, text)
+        except OSError as e:
+            # 次の変更時に全体を書き直すので、ここでは再試行しない
+            print(f"[warn] settings not saved: {e}")
+
+
+def open_settings(app_name, defaults=None, legacy=None, directory=SETTINGS_DIR):
+    """アプリごとの設定ファイル <app_name>.settings.json を開く。
+    ファイルが無ければ legacy（read_legacy_settings の戻り値）を取り込んで保存する
+    """
+    return SettingsStore(Path(directory) / f"{app_name}.settings.json", defaults, legacy=legacy)
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""自動テーマ（Auto）の切替スケジュールとテーマファイルの読み込み（GUI 非依存）
+
+ダーク: DARK_START〜翌 LIGHT_START、ライト: LIGHT_START〜DARK_START。
+毎分ポーリングする代わりに次の切替時刻を求め、その時刻に単発タイマーを張る。
+"""
+
+import re
+import json
+import time
+from pathlib import Path
+
+DARK_START = (18, 0)   # (時, 分) この時刻からダーク
+LIGHT_START = (6, 0)   # (時, 分) この時刻からライト
+TIME_JUMP_THRESHOLD_S = 2.5  # 1秒ティックの間隔がこれを超えたら（スリープ復帰/時計変更）予定を張り直す
+
+# 追加テーマの定義ファイル（任意）。{"テーマ名": {"bg": ..., "line": ..., ...}, ...}
+THEME_FILE = Path(__file__).parent / "themes.json"
+THEME_KEYS = ("bg", "line", "number", "tick", "second")
+THEME_NAME_PATTERN = re.compile(r"^[A-Za-z0-9_-]+$")  # スタイルシートのセレクタに埋め込むため
+
+
+def is_dark_time(now=None):
+    """
+    now（struct_time。省略時は現在時刻）がダークの時間帯かどうか
+    """
+    if now is None:
+        now = time.localtime()
+    current = now.tm_hour * 60 + now.tm_min
+    dark = DARK_START[0] * 60 + DARK_START[1]
+    light = LIGHT_START[0] * 60 + LIGHT_START[1]
+    if dark > light:
+        return current >= dark or current < light
+    return dark <= current < light
+
+
+def next_transition(epoch=None):
+    """
+    epoch（省略時は現在）より後で最初にテーマが切り替わる時刻（epoch 秒）
+    """
+    if epoch is None:
+        epoch = time.time()
+    local = time.localtime(epoch)
+    candidates = []
+    for day_offset in (0, 1):
+        for hour, minute in (DARK_START, LIGHT_START):
+            # mktime は日付の繰り上がりと夏時間（tm_isdst=-1）を処理する
+            at = time.mktime((local.tm_year, local.tm_mon, local.tm_mday + day_offset,
+                              hour, minute, 0, 0, 0, -1))
+            if at > epoch:
+                candidates.append(at)
+    return min(candidates)
+
+
+def seconds_until_transition(epoch=None):
+    if epoch is None:
+        epoch = time.time()
+    return next_transition(epoch) - epoch
+
+
+def load_theme_specs(builtin, path=THEME_FILE, is_valid_color=None):
+    """
+    組み込みテーマ（{名前: 色の dict}）にテーマファイルの定義を追加/上書きして返す。
+    ファイルが無い/壊れている場合は組み込みのみ。欠けている色は最初の組み込みテーマで補う。
+    is_valid_color（色の文字列 → bool。GUI 側の判定）があれば、解釈できない色を含むテーマは無視する
+    （スタイルシートに埋め込むため、"}" などを含む値が他のテーマまで壊さないように）。
+    """
+    specs = {name: dict(spec) for name, spec in builtin.items()}
+    fallback = next(iter(builtin.values()))
+    try:
+        with open(path, encoding="utf-8") as f:
+            loaded = json.load(f)
+    except FileNotFoundError:
+        return specs
+    except (OSError, ValueError) as e:
+        print(f"[warn] theme file ignored: {e}")
+        return specs
+    if not isinstance(loaded, dict):
+        print("[warn] theme file ignored: top level must be an object")
+        return specs
+    for name, spec in loaded.items():
+        if not THEME_NAME_PATTERN.match(name) or not isinstance(spec, dict):
+            print(f"[warn] theme '{name}' ignored")
+            continue
+        base = specs.get(name, fallback)
+        colors = {key: str(spec.get(key, base[key])) for key in THEME_KEYS}
+        if is_valid_color is not None:
+            invalid = [key for key, value in colors.items() if not is_valid_color(value)]
+            if invalid:
+                print(f"[warn] theme '{name}' ignored: invalid color ({', '.join(invalid)})")
+                continue
+        specs[name] = colors
+    return specs
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""時刻スナップショットと購読周期（GUI 非依存）"""
+
+import time
+from typing import NamedTuple
+
+# 購読周期: 値が変わったときだけ購読者へ配信する
+CADENCE_SECOND = "second"
+CADENCE_MINUTE = "minute"
+CADENCE_HOUR = "hour"
+
+
+class TimeSnapshot(NamedTuple):
+    """1回のティックで一度だけ取得した時刻。全購読者が同じ値を見る"""
+    epoch: float
+    local: time.struct_time
+
+    @property
+    def hour(self):
+        return self.local.tm_hour
+
+    @property
+    def minute(self):
+        return self.local.tm_min
+
+    @property
+    def second(self):
+        return self.local.tm_sec
+
+    def strftime(self, fmt):
+        return time.strftime(fmt, self.local)
+
+
+def take_snapshot(epoch=None):
+    if epoch is None:
+        epoch = time.time()
+    return TimeSnapshot(epoch, time.localtime(epoch))
+
+
+def cadence_key(snapshot, cadence):
+    """周期ごとの比較キー。前回配信時と異なれば配信する"""
+    t = snapshot.local
+    if cadence == CADENCE_HOUR:
+        return (t.tm_year, t.tm_yday, t.tm_hour)
+    if cadence == CADENCE_MINUTE:
+        return (t.tm_year, t.tm_yday, t.tm_hour, t.tm_min)
+    return (t.tm_year, t.tm_yday, t.tm_hour, t.tm_min, t.tm_sec)
+
+
+class ReadoutFormat(NamedTuple):
+    """デジタル表示の書式。桁数が時刻によって変わらない（固定幅）ように組み立てる"""
+    hour24: bool = True
+    show_date: bool = True
+    show_ms: bool = False
+
+
+DEFAULT_READOUT_FORMAT = ReadoutFormat()
+
+
+def format_readout(epoch, fmt=DEFAULT_READOUT_FORMAT, local=None):
+    """epoch をデジタル表示用の文字列へ（例: 2024-01-02 13:04:05.678 / 01:04:05 PM）"""
+    if local is None:
+        local = time.localtime(epoch)
+    if fmt.hour24:
+        text = "%02d:%02d:%02d" % (local.tm_hour, local.tm_min, local.tm_sec)
+    else:
+        text = "%02d:%02d:%02d" % (local.tm_hour % 12 or 12, local.tm_min, local.tm_sec)
+    if fmt.show_ms:
+        text += ".%03d" % (int(epoch * 1000) % 1000)
+    if not fmt.hour24:
+        # %p はロケールで幅が変わるため AM/PM 固定
+        text += " PM" if local.tm_hour >= 12 else " AM"
+    if fmt.show_date:
+        text = "%04d-%02d-%02d " % (local.tm_year, local.tm_mon, local.tm_mday) + text
+    return text
@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+"""タイムゾーンごとの UTC オフセット切替表（GUI 非依存）
+
+世界時計では多数のゾーンの現地時刻を毎秒求める。zoneinfo で毎回変換する代わりに、
+現在を含む一定期間のオフセット切替時刻を一度だけ求めて表にしておき、毎秒は
+二分探索でオフセットを引いて time.gmtime(epoch + オフセット) で現地時刻を得る。
+表の期間を外れたら（長時間稼働・時計変更）その時点を中心に作り直す。
+"""
+
+import time
+from array import array
+from bisect import bisect_right
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+from clock_time import TimeSnapshot
+
+ZONE_INDEX_PAST_S = 2 * 86400      # 表を作る期間: 現在の何秒前から
+ZONE_INDEX_FUTURE_S = 400 * 86400  # 現在の何秒後まで
+ZONE_SCAN_STEP_S = 86400           # この間隔でオフセットを調べ、変化した区間は二分探索で秒単位まで詰める
+
+
+class ZoneOffsets:
+    """1つのタイムゾーンのオフセット切替表。offsets[i] は transitions[i] 以降のオフセット（秒）"""
+    __slots__ = ("key", "label", "_zone", "_start", "_end", "_transitions", "_offsets")
+
+    def __init__(self, key, label=None, epoch=None):
+        self.key = key
+        self.label = label or key
+        self._zone = ZoneInfo(key)  # 不明なゾーンは ZoneInfoNotFoundError
+        self.rebuild(time.time() if epoch is None else epoch)
+
+    def _utcoffset(self, epoch):
+        return int(datetime.fromtimestamp(epoch, self._zone).utcoffset().total_seconds())
+
+    def rebuild(self, epoch):
+        start = int(epoch) - ZONE_INDEX_PAST_S
+        end = int(epoch) + ZONE_INDEX_FUTURE_S
+        current = self._utcoffset(start)
+        transitions = array('q', [start])
+        offsets = array('q', [current])
+        t = start
+        while t < end:
+            step_end = min(t + ZONE_SCAN_STEP_S, end)
+            if self._utcoffset(step_end) == current:
+                t = step_end
+                continue
+            # offset(lo) == current、offset(hi) != current を保って切替の秒を探す
+            lo, hi = t, step_end
+            while hi - lo > 1:
+                mid = (lo + hi) // 2
+                if self._utcoffset(mid) == current:
+                    lo = mid
+                else:
+                    hi = mid
+            current = self._utcoffset(hi)
+            transitions.append(hi)
+            offsets.append(current)
+            t = hi
+        self._start = start
+        self._end = end
+        self._transitions = transitions
+        self._offsets = offsets
+
+    def transition_count(self):
+        return len(self._transitions) - 1
+
+    def offset_at(self, epoch):
+        if not self._start <= epoch < self._end:
+            self.rebuild(epoch)
+        return self._offsets[bisect_right(self._transitions, epoch) - 1]
+
+    def snapshot(self, snapshot):
+        """ローカル時刻のスナップショットをこのゾーンの時刻へ（epoch は共通）。
+        tm_isdst/tm_zone は意味を持たないため使わないこと
+        """
+        return TimeSnapshot(snapshot.epoch, time.gmtime(snapshot.epoch + self.offset_at(snapshot.epoch)))
+
+
+def parse_zone(spec):
+    """'Asia/Tokyo' または 'Asia/Tokyo=東京'（= 以降は表示名）から ZoneOffsets を作る"""
+    key, _, label = spec.partition("=")
+    return ZoneOffsets(key.strip(), label.strip() or None)
+
+
+def load_zone_file(path):
+    """1行に1ゾーン（parse_zone の書式）。空行と # 以降は無視"""
+    zones = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.split("#", 1)[0].strip()
+            if line:
+                zones.append(parse_zone(line))
+    return zones
@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+"""時計の画像を一括で書き出す（サイネージ/動画オーバーレイ用）
+
+ClockWidget の描画をそのまま使い、指定した時刻範囲の各フレームをオフスクリーンの QImage へ描いて
+PNG 連番・1枚のスプライトシート・標準出力への生フレーム（RGBA）のいずれかに出力する。
+フレームはプロセスプールで分担し、各ワーカーは ClockWidget を1つだけ作って文字盤キャッシュを使い回す。
+
+    # 12時間分（1秒ごと 43,200 枚）を 200px のダークで PNG 連番に
+    python render_clock_frames.py --start 00:00:00 --count 43200 --size 200 --theme dark --png frames
+    # 1分分を 10 列のスプライトシートに
+    python render_clock_frames.py --count 60 --size 100 --sheet sheet.png --columns 10
+    # 生フレームを ffmpeg へ
+    python render_clock_frames.py --count 3600 --raw | ffmpeg -f rawvideo -pix_fmt rgba -s 400x400 -r 1 -i - clock.mp4
+"""
+
+import os
+import sys
+import time
+import argparse
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+
+# Qt を import する前にオフスクリーン描画を指定する（ワーカーも環境変数を引き継ぐ）
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+DEFAULT_COUNT = 12 * 3600  # 既定は12時間分（1秒ごと）
+DEFAULT_SIZE = 400
+CHUNK_FRAMES = 120         # ワーカーへ一度に渡すフレーム数
+PENDING_PER_WORKER = 2     # 順序を保って受け取るため、先行して投入しておく塊の数（メモリの上限）
+SHEET_MAX_SIDE = 32767     # スプライトシートの1辺の上限（QPainter のラスタ描画の座標上限）
+PNG_NAME = "clock_{:05d}.png"
+
+# ワーカーごとの状態（_init_worker で作る）
+_worker = None
+
+
+class _Worker:
+    """1プロセスにつき1つ。ClockWidget と描画先の QImage を使い回す"""
+    __slots__ = ("app", "widget", "image", "qt_clock", "sweep", "mode", "directory")
+
+    def __init__(self, size, theme_name, zone, sweep, mode, directory, hand_atlas_mb):
+        from PySide6.QtGui import QImage
+        from PySide6.QtWidgets import QApplication
+        import app_analog_clock_2 as qt_clock
+        from clock_zones import parse_zone
+
+        self.app = QApplication.instance() or QApplication(sys.argv[:1])
+        self.qt_clock = qt_clock
+        themes = qt_clock.load_themes()
+        self.widget = qt_clock.ClockWidget(None, size / qt_clock.WINDOW_SIZE, zone=parse_zone(zone) if zone else None)
+        self.widget.set_theme(themes[theme_name])
+        self.widget.resize(size, size)
+        self.widget.set_hand_atlas(hand_atlas_mb)
+        # 背景は不透明なので、乗算済み RGBA のバイト列はそのまま RGBA として使える
+        self.image = QImage(size, size, QImage.Format_RGBA8888_Premultiplied)
+        self.sweep = sweep
+        self.mode = mode
+        self.directory = directory
+
+    def render(self, epoch):
+        widget = self.widget
+        snapshot = widget.local_snapshot(self.qt_clock.take_snapshot(epoch))
+        widget.show_frame(widget.engine.frame(snapshot, self.qt_clock.SWEEP_STEPS if self.sweep else 0))
+        widget.render(self.image)
+        return self.image
+
+    def run(self, first, epochs):
+        """連番 first から epochs の各時刻を描く。PNG は直接保存し、それ以外は RGBA を連結して返す"""
+        if self.mode == "png":
+            for i, epoch in enumerate(epochs, first):
+                if not self.render(epoch).save(str(self.directory / PNG_NAME.format(i)), "PNG"):
+                    raise OSError(f"cannot write {self.directory / PNG_NAME.format(i)}")
+            return len(epochs)
+        out = bytearray()
+        for epoch in epochs:
+            out += self.render(epoch).constBits()
+        return bytes(out)
+
+
+def _init_worker(size, theme_name, zone, sweep, mode, directory, hand_atlas_mb):
+    global _worker
+    _worker = _Worker(size, theme_name, zone, sweep, mode, directory, hand_atlas_mb)
+
+
+def _run_chunk(first, epochs):
+    return _worker.run(first, epochs)
+
+
+def parse_start(text):
+    """'HH:MM[:SS]'（今日の現地時刻）/ ISO 形式の日時 / epoch 秒"""
+    if text is None:
+        return time.mktime(datetime.now().replace(hour=0, minute=0, second=0, microsecond=0).timetuple())
+    try:
+        return float(text)
+    except ValueError:
+        pass
+    if len(text) <= 8 and ":" in text:
+        parts = [int(p) for p in text.split(":")]
+        parts += [0] * (3 - len(parts))
+        start = datetime.now().replace(hour=parts[0], minute=parts[1], second=parts[2], microsecond=0)
+    else:
+        start = datetime.fromisoformat(text)
+    return start.timestamp()
+
+
+def render_frames(args, epochs, consume):
+    """epochs を塊に分けてワーカーへ配り、結果を連番順に consume(first, result) へ渡す"""
+    chunks = [(i, epochs[i:i + args.chunk]) for i in range(0, len(epochs), args.chunk)]
+    directory = Path(args.png) if args.png else None
+    mode = "png" if args.png else "raw"
+    initargs = (args.size, args.theme, args.zone, args.sweep, mode, directory, args.hand_atlas)
+    # Qt はフォーク後の子プロセスで安全に使えないため spawn で起動する
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(args.workers, mp_context=context, initializer=_init_worker, initargs=initargs) as pool:
+        pending = deque()
+        for first, chunk in chunks:
+            pending.append((first, pool.submit(_run_chunk, first, chunk)))
+            if len(pending) >= args.workers * PENDING_PER_WORKER:
+                first_done, future = pending.popleft()
+                consume(first_done, future.result())
+        while pending:
+            first_done, future = pending.popleft()
+            consume(first_done, future.result())
+
+
+def main():
+    import app_analog_clock_2 as qt_clock
+    parser = argparse.ArgumentParser(description="時計の画像を一括で書き出す")
+    parser.add_argument("--start", help="最初の時刻（HH:MM[:SS] / ISO 日時 / epoch 秒。既定: 今日の 00:00:00）")
+    parser.add_argument("--count", type=int, default=DEFAULT_COUNT, help="フレーム数（既定: 12時間分）")
+    parser.add_argument("--step", type=float, default=1.0, help="フレーム間隔（秒）")
+    parser.add_argument("--size", type=int, default=DEFAULT_SIZE, help="1フレームの1辺（px）")
+    parser.add_argument("--theme", default="light", help="テーマ名（themes.json の追加テーマも可）")
+    parser.add_argument("--zone", help="タイムゾーン（例: Asia/Tokyo。既定: 現地時刻）")
+    parser.add_argument("--sweep", action="store_true", help="秒針/分針を連続的に動かす（--step が1秒未満のとき）")
+    parser.add_argument("--hand-atlas", type=int, nargs="?", const=qt_clock.HAND_ATLAS_LIMIT_MB, default=0, metavar="MB",
+                        help="針をアトラスから転送する（フレーム数が多いときに速い。上限 MB）")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="ワーカープロセス数")
+    parser.add_argument("--chunk", type=int, default=CHUNK_FRAMES, help="ワーカーへ一度に渡すフレーム数")
+    output = parser.add_mutually_exclusive_group(required=True)
+    output.add_argument("--png", metavar="DIR", help=f"PNG 連番（{PNG_NAME.format(0)} ...）を書き出すフォルダ")
+    output.add_argument("--sheet", metavar="FILE", help="全フレームを並べた1枚のスプライトシート（PNG）")
+    output.add_argument("--raw", action="store_true", help="RGBA の生フレームを標準出力へ（ffmpeg の rawvideo 向け）")
+    parser.add_argument("--columns", type=int, default=0, help="スプライトシートの列数（0 で正方形に近く）")
+    args = parser.parse_args()
+
+    if args.count <= 0 or args.size <= 0 or args.step <= 0 or args.workers <= 0 or args.chunk <= 0:
+        parser.error("--count/--size/--step/--workers/--chunk must be positive")
+    try:
+        start = parse_start(args.start)
+    except ValueError as e:
+        parser.error(f"--start: {e}")
+    themes = qt_clock.load_themes()
+    if args.theme not in themes:
+        parser.error(f"--theme: unknown theme '{args.theme}' ({', '.join(themes)})")
+    epochs = [start + i * args.step for i in range(args.count)]
+    frame_bytes = args.size * args.size * 4
+
+    started = time.perf_counter()
+    if args.png:
+        Path(args.png).mkdir(parents=True, exist_ok=True)
+        render_frames(args, epochs, lambda first, n: None)
+        destination = args.png
+    elif args.raw:
+        stdout = sys.stdout.buffer
+        def write(first, data):
+            stdout.write(data)
+        render_frames(args, epochs, write)
+        stdout.flush()
+        destination = "stdout"
+    else:
+        from PySide6.QtGui import QImage, QPainter
+        from PySide6.QtWidgets import QApplication
+        columns = args.columns or max(1, round(args.count ** 0.5))
+        rows = (args.count + columns - 1) // columns
+        if max(columns, rows) * args.size > SHEET_MAX_SIDE:
+            parser.error(f"sprite sheet too large ({columns * args.size}x{rows * args.size}px, max side {SHEET_MAX_SIDE})")
+        app = QApplication.instance() or QApplication(sys.argv[:1])
+        sheet = QImage(columns * args.size, rows * args.size, QImage.Format_RGBA8888_Premultiplied)
+        sheet.fill(themes[args.theme].bg)
+        painter = QPainter(sheet)
+        def place(first, data):
+            for k in range(len(data) // frame_bytes):
+                frame = QImage(data[k * frame_bytes:(k + 1) * frame_bytes], args.size, args.size,
+                               QImage.Format_RGBA8888_Premultiplied)
+                i = first + k
+                painter.drawImage((i % columns) * args.size, (i // columns) * args.size, frame)
+        render_frames(args, epochs, place)
+        painter.end()
+        if not sheet.save(args.sheet, "PNG"):
+            print(f"[error] cannot write {args.sheet}", file=sys.stderr)
+            sys.exit(1)
+        destination = f"{args.sheet} ({columns}x{rows})"
+    elapsed = time.perf_counter() - started
+    # 標準出力はフレームに使うことがあるため、報告は標準エラーへ
+    print(f"[render] {args.count} frames {args.size}x{args.size} theme={args.theme} workers={args.workers} "
+          f"-> {destination}: {elapsed:.2f}s, {args.count / elapsed:.1f} frames/s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+# -*- coding: utf-8 -*-
+"""テストからリポジトリ直下のモジュール（clock_*.py など）を import できるようにする"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
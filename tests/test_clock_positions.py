@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+"""clock_positions: ジャーナルの形式・壊れた行の読み飛ばし・詰め直し・旧形式の引き継ぎ"""
+
+import re
+
+import clock_positions as cp
+
+
+def write_lines(path, *chunks):
+    with open(path, "ab") as f:
+        for chunk in chunks:
+            f.write(chunk.encode("utf-8") if isinstance(chunk, str) else chunk)
+
+
+def open_store(tmp_path, host="hostA", **kwargs):
+    return cp.PositionStore(tmp_path, host=host, delay_s=0, **kwargs)
+
+
+# ---------------------- 1行の形式 ----------------------
+def test_parse_record_roundtrip():
+    line = cp.format_record("hostA", [-10, 20], when=1700000000)
+    assert line.endswith("\n")
+    assert cp.parse_record(line[:-1], "hostA") == [-10, 20]
+
+
+def test_parse_record_rejects_bad_crc():
+    payload, _, crc = cp.format_record("hostA", [1, 2])[:-1].rpartition("\t")
+    assert cp.parse_record(f"{payload}\t{int(crc, 16) ^ 1:08x}", "hostA") is None
+    assert cp.parse_record(payload.replace("\t1\t", "\t7\t") + "\t" + crc, "hostA") is None
+
+
+def test_parse_record_rejects_other_host_and_garbage():
+    assert cp.parse_record(cp.format_record("hostB", [1, 2])[:-1], "hostA") is None
+    for line in ("", "hostA", "hostA\t1\t2", "\x00\x00\x00", "hostA\tx\ty\t0\tzz"):
+        assert cp.parse_record(line, "hostA") is None
+
+
+def test_host_file_name_is_safe():
+    assert re.fullmatch(r"pc-01\.corp-[0-9a-f]{8}\.pos", cp.host_file_name("PC-01.corp"))
+    assert re.fullmatch(r"a_b_c_d-[0-9a-f]{8}\.pos", cp.host_file_name("a/b\\c:d"))
+
+
+def test_host_file_name_is_one_to_one():
+    # 置き換え/小文字化で同じ形になるホスト名も別のファイルにする
+    names = {cp.host_file_name(h) for h in ("PC.A", "pc.a", "pc_a", "pc:a")}
+    assert len(names) == 4
+
+
+# ---------------------- 末尾からの読み込み ----------------------
+def test_read_position_takes_last_valid_line(tmp_path):
+    path = tmp_path / "hostA.pos"
+    write_lines(path, cp.format_record("hostA", [1, 2]), cp.format_record("hostA", [3, 4]),
+                "hostA\t9\t9\t0\tdeadbeef\n",            # CRC 不一致
+                cp.format_record("hostB", [5, 6]),        # 別ホスト
+                "\x00\x00garbage\n",
+                "hostA\t7\t7")                            # 書き込み途中（改行なし）
+    assert cp.read_position(path, "hostA") == [3, 4]
+
+
+def test_read_position_missing_or_empty(tmp_path):
+    assert cp.read_position(tmp_path / "none.pos", "hostA") is None
+    (tmp_path / "empty.pos").write_bytes(b"")
+    assert cp.read_position(tmp_path / "empty.pos", "hostA") is None
+
+
+def test_read_position_accepts_crlf(tmp_path):
+    path = tmp_path / "hostA.pos"
+    write_lines(path, cp.format_record("hostA", [8, 9]).replace("\n", "\r\n"))
+    assert cp.read_position(path, "hostA") == [8, 9]
+
+
+def test_read_position_reads_only_the_tail(tmp_path):
+    path = tmp_path / "hostA.pos"
+    record = cp.format_record("hostA", [1, 1])
+    write_lines(path, record * (cp.TAIL_BYTES // len(record) * 3), cp.format_record("hostA", [2, 2]))
+    assert path.stat().st_size > cp.TAIL_BYTES
+    assert cp.read_position(path, "hostA") == [2, 2]
+
+
+def test_read_position_ignores_records_before_the_tail(tmp_path):
+    # 末尾 TAIL_BYTES に正しい行が無ければ、それより前は読まない（起動時の読み込み量を一定にする）
+    path = tmp_path / "hostA.pos"
+    write_lines(path, cp.format_record("hostA", [1, 1]), ("x" * 80 + "\n") * (cp.TAIL_BYTES // 80 + 1))
+    assert cp.read_position(path, "hostA") is None
+
+
+def test_read_position_skips_line_cut_by_the_tail(tmp_path):
+    path = tmp_path / "hostA.pos"
+    record = cp.format_record("hostA", [4, 5])
+    # 末尾 TAIL_BYTES の先頭が記録の途中になるよう、後ろに詰め物の行を置く
+    filler = "y" * (cp.TAIL_BYTES - len(record) // 2 - 1) + "\n"
+    write_lines(path, record, filler)
+    assert cp.read_position(path, "hostA") is None
+
+
+# ---------------------- 保存 ----------------------
+def test_store_appends_one_line_per_save(tmp_path):
+    store = open_store(tmp_path)
+    for i in range(5):
+        store.set([i, -i])
+        store.flush()
+    store.set([4, -4])  # 変わらなければ書かない
+    store.close()
+    path = tmp_path / cp.host_file_name("hostA")
+    assert len(path.read_bytes().splitlines()) == 5
+    assert open_store(tmp_path).get() == [4, -4]
+
+
+def test_store_append_after_partial_line(tmp_path):
+    path = tmp_path / cp.host_file_name("hostA")
+    write_lines(path, cp.format_record("hostA", [299, 300]), "hostA\t5\t5")
+    store = open_store(tmp_path)
+    assert store.get() == [299, 300]
+    store.set([42, 43])
+    store.close()
+    assert cp.read_position(path, "hostA") == [42, 43]
+
+
+def test_store_compacts_past_threshold(tmp_path):
+    path = tmp_path / cp.host_file_name("hostA")
+    record = cp.format_record("hostA", [0, 0])
+    count = cp.COMPACT_BYTES // len(record) - 1
+    write_lines(path, record * count)
+    store = open_store(tmp_path)
+    store.set([1, 1])
+    store.flush()
+    assert len(path.read_bytes().splitlines()) == count + 1  # 上限以内なら追記のみ
+    store.set([2, 2])
+    store.close()
+    lines = path.read_bytes().splitlines()
+    assert len(lines) == 1  # 上限を超えた回に最後の1行へ詰める
+    assert cp.parse_record(lines[0].decode("utf-8"), "hostA") == [2, 2]
+
+
+def test_store_hosts_do_not_share_files(tmp_path):
+    a = open_store(tmp_path, "hostA")
+    b = open_store(tmp_path, "hostB")
+    a.set([1, 2])
+    b.set([3, 4])
+    a.close()
+    b.close()
+    assert sorted(p.name for p in tmp_path.iterdir()) == sorted(
+        [cp.host_file_name("hostA"), cp.host_file_name("hostB")])
+    assert open_store(tmp_path, "hostA").get() == [1, 2]
+    assert open_store(tmp_path, "hostB").get() == [3, 4]
+
+
+# ---------------------- 旧形式の引き継ぎ ----------------------
+def test_legacy_seeds_only_without_record(tmp_path):
+    assert open_store(tmp_path, legacy=[10, 20]).get() == [10, 20]
+    assert open_store(tmp_path, legacy=None).get() is None
+    assert open_store(tmp_path, legacy=["x", 1]).get() is None
+    store = open_store(tmp_path, legacy=[10, 20])
+    store.set([30, 40])
+    store.close()
+    assert open_store(tmp_path, legacy=[10, 20]).get() == [30, 40]
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""clock_theme: 自動テーマの次の切替時刻（日付の繰り上がり・夏時間）とテーマファイルの検証"""
+
+import json
+import time
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import pytest
+
+import clock_theme
+
+ZONE = "America/New_York"  # 夏時間のあるゾーン（2024-03-10 02:00 → 03:00、2024-11-03 02:00 → 01:00）
+
+pytestmark = pytest.mark.skipif(not hasattr(time, "tzset"), reason="time.tzset が使えない（Windows）")
+
+
+@pytest.fixture(autouse=True)
+def local_zone(monkeypatch):
+    """time.localtime/mktime を ZONE で動かす（終了後に元のゾーンへ戻す）"""
+    monkeypatch.setenv("TZ", ZONE)
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+def local(*fields):
+    return datetime(*fields, tzinfo=ZoneInfo(ZONE)).timestamp()
+
+
+@pytest.mark.parametrize("now, expected", [
+    ((2024, 6, 1, 10, 0), (2024, 6, 1, 18, 0)),      # 昼 → 同じ日の夕方
+    ((2024, 6, 1, 3, 0), (2024, 6, 1, 6, 0)),        # 深夜 → 同じ日の朝
+    ((2024, 6, 1, 20, 0), (2024, 6, 2, 6, 0)),       # 夜 → 翌朝
+    ((2024, 6, 1, 18, 0), (2024, 6, 2, 6, 0)),       # 切替時刻ちょうどは次の切替へ
+    ((2024, 6, 30, 23, 59), (2024, 7, 1, 6, 0)),     # 月の繰り上がり
+    ((2024, 12, 31, 20, 0), (2025, 1, 1, 6, 0)),     # 年の繰り上がり
+    ((2024, 2, 28, 19, 0), (2024, 2, 29, 6, 0)),     # うるう日
+])
+def test_next_transition_day_rollover(now, expected):
+    assert clock_theme.next_transition(local(*now)) == local(*expected)
+
+
+def test_next_transition_spring_forward():
+    # 夏時間開始の夜は 9 時間後（02:00 が無い）
+    start = local(2024, 3, 9, 20, 0)
+    at = clock_theme.next_transition(start)
+    assert at == local(2024, 3, 10, 6, 0)
+    assert at - start == 9 * 3600
+
+
+def test_next_transition_fall_back():
+    # 夏時間終了の夜は 11 時間後（01:00 台が2回ある）
+    start = local(2024, 11, 2, 20, 0)
+    at = clock_theme.next_transition(start)
+    assert at == local(2024, 11, 3, 6, 0)
+    assert at - start == 11 * 3600
+
+
+def test_next_transition_is_always_after_and_matches_is_dark_time():
+    epoch = local(2024, 3, 8, 0, 0)
+    for _ in range(24 * 12):  # 10日分を1時間ごとに
+        at = clock_theme.next_transition(epoch)
+        assert epoch < at <= epoch + 86400
+        # 切替の直前と直後で時間帯が変わる
+        assert clock_theme.is_dark_time(time.localtime(at - 1)) != clock_theme.is_dark_time(time.localtime(at))
+        epoch += 3600
+
+
+def test_seconds_until_transition():
+    now = local(2024, 6, 1, 17, 59, 30)
+    assert clock_theme.seconds_until_transition(now) == 30
+
+
+@pytest.mark.parametrize("hour, minute, dark", [
+    (5, 59, True), (6, 0, False), (17, 59, False), (18, 0, True), (0, 0, True),
+])
+def test_is_dark_time(hour, minute, dark):
+    assert clock_theme.is_dark_time(time.localtime(local(2024, 6, 1, hour, minute))) is dark
+
+
+# ---------------------- テーマファイル ----------------------
+BUILTIN = {"light": dict.fromkeys(clock_theme.THEME_KEYS, "white"), "dark": dict.fromkeys(clock_theme.THEME_KEYS, "black")}
+
+
+def test_load_theme_specs_validates_colors(tmp_path, capsys):
+    path = tmp_path / "themes.json"
+    path.write_text(json.dumps({
+        "good": {"bg": "#101010"},
+        "broken": {"bg": "black; } QWidget { color: red"},
+        "bad name": {"bg": "#000000"},
+    }), encoding="utf-8")
+    specs = clock_theme.load_theme_specs(BUILTIN, path, is_valid_color=lambda v: "}" not in v and " " not in v)
+    assert sorted(specs) == ["dark", "good", "light"]
+    assert specs["good"]["bg"] == "#101010"
+    assert specs["good"]["line"] == "white"  # 欠けた色は最初の組み込みテーマで補う
+    out = capsys.readouterr().out
+    assert "theme 'broken' ignored" in out and "theme 'bad name' ignored" in out
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+"""clock_zones: オフセット切替表の結果が zoneinfo と一致すること"""
+
+import random
+from datetime import datetime, timezone
+from zoneinfo import ZoneInfo
+
+import pytest
+
+import clock_zones
+from clock_time import take_snapshot
+
+# 夏時間あり/なし・30分/45分単位・南半球を含める
+ZONES = ["America/New_York", "Europe/London", "Australia/Lord_Howe", "Asia/Kolkata",
+         "Pacific/Chatham", "America/Santiago", "Asia/Tokyo"]
+BASE = datetime(2024, 1, 15, tzinfo=timezone.utc).timestamp()
+
+
+def expected_offset(key, epoch):
+    return int(datetime.fromtimestamp(epoch, ZoneInfo(key)).utcoffset().total_seconds())
+
+
+@pytest.mark.parametrize("key", ZONES)
+def test_offset_at_matches_zoneinfo_at_random_instants(key):
+    zone = clock_zones.ZoneOffsets(key, epoch=BASE)
+    rng = random.Random(key)
+    lo = BASE - clock_zones.ZONE_INDEX_PAST_S
+    hi = BASE + clock_zones.ZONE_INDEX_FUTURE_S
+    for _ in range(2000):
+        epoch = rng.randrange(int(lo), int(hi))
+        assert zone.offset_at(epoch) == expected_offset(key, epoch), epoch
+
+
+@pytest.mark.parametrize("key", ZONES)
+def test_offset_at_matches_zoneinfo_around_transitions(key):
+    zone = clock_zones.ZoneOffsets(key, epoch=BASE)
+    for at in zone._transitions[1:]:
+        for epoch in (at - 1, at, at + 1):
+            assert zone.offset_at(epoch) == expected_offset(key, epoch), epoch
+
+
+def test_transition_counts():
+    assert clock_zones.ZoneOffsets("Asia/Tokyo", epoch=BASE).transition_count() == 0
+    # 約13か月分なので、夏時間のあるゾーンは開始/終了を2回以上含む
+    assert clock_zones.ZoneOffsets("America/New_York", epoch=BASE).transition_count() >= 2
+
+
+def test_offset_at_rebuilds_outside_the_table():
+    zone = clock_zones.ZoneOffsets("Europe/London", epoch=BASE)
+    far = BASE + 3 * 365 * 86400 + 180 * 86400  # 表の範囲外（夏）
+    assert zone.offset_at(far) == expected_offset("Europe/London", far) == 3600
+    assert zone.offset_at(BASE) == 0  # 作り直した表でも前の時刻を引ける
+
+
+@pytest.mark.parametrize("key", ZONES)
+def test_snapshot_matches_local_wall_time(key):
+    zone = clock_zones.ZoneOffsets(key, epoch=BASE)
+    rng = random.Random(1)
+    for _ in range(200):
+        epoch = BASE + rng.random() * 300 * 86400
+        local = zone.snapshot(take_snapshot(epoch)).local
+        wall = datetime.fromtimestamp(epoch, ZoneInfo(key))
+        assert (local.tm_year, local.tm_mon, local.tm_mday, local.tm_hour, local.tm_min, local.tm_sec) == \
+               (wall.year, wall.month, wall.day, wall.hour, wall.minute, wall.second)
+
+
+def test_parse_zone_and_zone_file(tmp_path):
+    zone = clock_zones.parse_zone(" Asia/Tokyo = 東京 ")
+    assert (zone.key, zone.label) == ("Asia/Tokyo", "東京")
+    path = tmp_path / "zones.txt"
+    path.write_text("# 一覧\nEurope/London=ロンドン\n\nAmerica/New_York  # 東部\n", encoding="utf-8")
+    assert [(z.key, z.label) for z in clock_zones.load_zone_file(path)] == \
+           [("Europe/London", "ロンドン"), ("America/New_York", "America/New_York")]
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+"""秒針音（機械式クリック）の合成と、パラメータをキーにしたディスクキャッシュ（GUI 非依存）
+
+クリック音は短いインパルス＋減衰するハイパス風ノイズ。パラメータ（長さ・振幅・乱数シード等）
+からキーを作り、tick_<key>.wav として保存する。キャッシュが壊れている/形式が合わない場合は
+自動で作り直す。パラメータや合成方法が変われば別ファイルになるため古い音が残っても使われない。
+"""
+
+import sys
+import wave
+import random
+import hashlib
+from array import array
+from pathlib import Path
+from typing import NamedTuple
+
+from clock_settings import write_atomic
+
+# 合成アルゴリズムを変更したら上げる（キャッシュキーに含める）
+SYNTH_VERSION = 1
+TICK_CACHE_DIR = Path(__file__).parent / "tick_sounds"
+
+
+class TickSoundParams(NamedTuple):
+    sample_rate: int = 44100
+    duration_sec: float = 0.06
+    attack_sec: float = 0.002     # 立ち上がり
+    impulse_sec: float = 0.0015   # 矩形に近いインパルスの長さ
+    click_amp: int = 12000
+    noise_amp: int = 7000
+    seed: int = 0
+
+
+DEFAULT_TICK_SOUND = TickSoundParams()
+
+
+def cache_key(params):
+    text = repr((SYNTH_VERSION,) + tuple(params))
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:16]
+
+
+def frame_count(params):
+    return int(params.sample_rate * params.duration_sec)
+
+
+def synthesize_tick(params=DEFAULT_TICK_SOUND):
+    """16bit リトルエンディアン・モノラルの PCM バイト列を返す"""
+    num_samples = frame_count(params)
+    attack_samples = int(params.attack_sec * params.sample_rate)
+    decay_samples = num_samples - attack_samples
+    impulse_samples = int(params.impulse_sec * params.sample_rate)
+
+    # 包絡線: 線形の立ち上がり → 2乗で急速減衰
+    attack = max(1, attack_samples)
+    decay = max(1, decay_samples)
+    env = [i / attack for i in range(attack_samples)]
+    env += [max(0.0, 1.0 - j / decay) ** 2 for j in range(decay_samples)]
+
+    # ハイパス風ノイズ（白色雑音の差分）でメカ感を演出
+    rand = random.Random(params.seed).random
+    white = [rand() * 2.0 - 1.0 for _ in range(num_samples)]
+    highpass = [w - p for w, p in zip(white, [0.0] + white[:-1])]
+
+    noise_amp = params.noise_amp
+    samples = [noise_amp * h * e for h, e in zip(highpass, env)]
+    for i in range(min(impulse_samples, num_samples)):
+        samples[i] += params.click_amp
+
+    pcm = array('h', [max(-32767, min(32767, int(v))) for v in samples])
+    if sys.byteorder == "big":
+        pcm.byteswap()
+    return pcm.tobytes()
+
+
+def write_wav(path, params, pcm):
+    """16bit モノラルの WAV として保存する（途中まで書かれたキャッシュを残さない）"""
+    def write(f):
+        with wave.open(f, "wb") as wf:
+            wf.setnchannels(1)
+            wf.setsampwidth(2)
+            wf.setframerate(params.sample_rate)
+            wf.writeframes(pcm)
+    write_atomic(path, write)
+
+
+def read_cached_pcm(path, params):
+    """キャッシュが期待どおりの形式なら PCM を返し、壊れていれば None"""
+    try:
+        with wave.open(str(path), "rb") as wf:
+            if (wf.getnchannels(), wf.getsampwidth(), wf.getframerate()) != (1, 2, params.sample_rate):
+                return None
+            if wf.getnframes() != frame_count(params):
+                return None
+            pcm = wf.readframes(wf.getnframes())
+    except (OSError, EOFError, wave.Error):
+        return None
+    return pcm if len(pcm) == frame_count(params) * 2 else None
+
+
+def tick_wav_path(params=DEFAULT_TICK_SOUND, cache_dir=TICK_CACHE_DIR):
+    return Path(cache_dir) / f"tick_{cache_key(params)}.wav"
+
+
+def load_tick(params=DEFAULT_TICK_SOUND, cache_dir=TICK_CACHE_DIR):
+    """(wav のパス, PCM バイト列) を返す。キャッシュが無い/壊れていれば合成して保存する
+
+    保存できなくても（読み取り専用の共有フォルダなど）合成した PCM はそのまま返す。
+    """
+    path = tick_wav_path(params, cache_dir)
+    pcm = read_cached_pcm(path, params) if path.exists() else None
+    if pcm is None:
+        pcm = synthesize_tick(params)
+        try:
+            write_wav(path, params, pcm)
+        except OSError as e:
+            print(f"[warn] tick sound cache not saved: {e}")
+    return path, pcm